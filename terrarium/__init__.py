@@ -17,7 +17,12 @@ from ._resource_types import *
 from ._resource_managers import *
 from ._util import *
 from ._errors import *
+from ._runtime_environment import (RuntimeEnvironment, get_runtime_environment, set_environ_tracking,
+                                   is_environ_tracking)
 from ._resource_io import json
+from . import _metrics as metrics
+from . import _tracing as tracing
+from . import _intern as interning
 
 _LOG = logging.getLogger(__name__)
 _LOG.addHandler(NullHandler())
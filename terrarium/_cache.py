@@ -0,0 +1,119 @@
+import collections
+import threading
+
+
+CacheInfo = collections.namedtuple('CacheInfo', ('hits', 'misses', 'maxsize', 'currsize'))
+
+_PREV, _NEXT, _KEY, _VALUE = 0, 1, 2, 3
+
+
+class LRUCache(object):
+    """
+    A bounded mapping that discards the least recently used entry when full.
+
+    Entries are held in a circular doubly linked list so that hits, insertions and evictions are all O(1).
+    Hit and miss counts are tracked for reporting through ``info``.
+
+    A hit relinks the entry, so even lookups modify the cache. Every operation holds the cache's own lock, which
+    makes a cache safe to share between threads.
+    """
+    __slots__ = ('_maxsize', '_links', '_root', '_hits', '_misses', '_lock')
+
+    def __init__(self, maxsize=1024):
+        """
+        Initializes an empty LRUCache.
+
+        Args:
+            maxsize (int): Maximum number of entries retained. Must be greater than zero.
+        """
+        super(LRUCache, self).__init__()
+
+        if maxsize < 1:
+            raise ValueError('LRUCache maxsize must be greater than zero.')
+
+        self._maxsize = maxsize
+        self._links = {}
+        self._root = []
+        self._root[:] = [self._root, self._root, None, None]
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        Retrieves the value cached for ``key`` and marks it as most recently used.
+
+        Args:
+            key: A hashable cache key.
+            default: Returned when ``key`` is not cached.
+
+        Returns:
+            The cached value or ``default``.
+        """
+        with self._lock:
+            link = self._links.get(key)
+            if link is None:
+                self._misses += 1
+                return default
+
+            link_prev, link_next = link[_PREV], link[_NEXT]
+            link_prev[_NEXT] = link_next
+            link_next[_PREV] = link_prev
+
+            root = self._root
+            last = root[_PREV]
+            last[_NEXT] = root[_PREV] = link
+            link[_PREV] = last
+            link[_NEXT] = root
+
+            self._hits += 1
+            return link[_VALUE]
+
+    def set(self, key, value):
+        """
+        Caches ``value`` under ``key``, evicting the least recently used entry if the cache is full.
+
+        Args:
+            key: A hashable cache key.
+            value: The value to cache.
+        """
+        with self._lock:
+            link = self._links.get(key)
+            if link is not None:
+                link[_VALUE] = value
+                return
+
+            root = self._root
+            if len(self._links) >= self._maxsize:
+                oldest = root[_NEXT]
+                root[_NEXT] = oldest[_NEXT]
+                oldest[_NEXT][_PREV] = root
+                del self._links[oldest[_KEY]]
+
+            last = root[_PREV]
+            link = [last, root, key, value]
+            last[_NEXT] = root[_PREV] = self._links[key] = link
+
+    def clear(self):
+        """
+        Discards every cached entry. Hit and miss statistics are retained.
+        """
+        with self._lock:
+            self._links.clear()
+            self._root[:] = [self._root, self._root, None, None]
+
+    def info(self):
+        """
+        Reports the effectiveness of the cache.
+
+        Returns:
+            A class::`CacheInfo` of hits, misses, maxsize and currsize.
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._maxsize, len(self._links))
+
+    def __len__(self):
+        return len(self._links)
+
+    def __contains__(self, key):
+        return key in self._links
@@ -26,3 +26,10 @@ class ResourceUpdateError(TerrariumError):
 class ResourceAttributeNotFoundError(ResourceUpdateError):
     """Raised when attempting to update a resource that does not have the target attribute"""
     pass
+
+
+class VariableCycleError(TerrariumError):
+    """Raised when an Environment variable references itself, directly or through other variables."""
+    def __init__(self, msg, cycle):
+        super(VariableCycleError, self).__init__(msg)
+        self.cycle = cycle
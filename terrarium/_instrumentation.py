@@ -0,0 +1,164 @@
+import collections
+import functools
+import logging
+import threading
+import timeit
+
+from . import _metrics
+
+
+_LOG = logging.getLogger(__name__)
+
+_clock = timeit.default_timer
+
+_hooks = []
+
+# True while hooks are installed or metrics are enabled. Instrumented calls check nothing else while it is False.
+_active = [False]
+
+
+class Span(collections.namedtuple('Span', ('operation', 'resource_type', 'resource_name', 'start', 'duration',
+                                           'thread_id', 'error'))):
+    """
+    Describes one call of an instrumented operation.
+
+    Attributes:
+        operation (str): The name of the operation, e.g. ``AppManager.get`` or ``Environment.expand``.
+        resource_type (str): The type of resource the operation acted on, or None.
+        resource_name (str): The name of the resource the operation acted on, or None.
+        start (float): When the call started, in seconds, from ``timeit.default_timer``.
+        duration (float): How long the call took, in seconds. None until the call has finished.
+        thread_id (int): Identifies the thread that made the call.
+        error (Exception): The exception raised by the call, or None.
+    """
+    __slots__ = ()
+
+
+def add_hook(before=None, after=None):
+    """
+    Installs callbacks run around every instrumented operation.
+
+    Args:
+        before (callable): Called with a class::`Span` when an operation starts. Its ``duration`` is None.
+        after (callable): Called with the completed class::`Span` when the operation finishes, even if it raised.
+
+    Returns:
+        A handle for ``remove_hook``.
+    """
+    handle = (before, after)
+    _hooks.append(handle)
+    _refresh()
+    return handle
+
+
+def remove_hook(handle):
+    """
+    Uninstalls callbacks installed with ``add_hook``.
+
+    Args:
+        handle: The value returned by ``add_hook``.
+    """
+    try:
+        _hooks.remove(handle)
+    except ValueError:
+        pass
+    _refresh()
+
+
+def _refresh():
+    _active[0] = bool(_hooks) or _metrics.is_enabled()
+
+
+def describe_managed_resource(args):
+    """
+    Describes the resource named by a ``ResourceManager`` classmethod call, ``(cls, name, ...)``.
+    """
+    name = args[1] if len(args) > 1 and isinstance(args[1], basestring) else None
+    return args[0]._resource_type.__name__, name
+
+
+def describe_resource(args):
+    """
+    Describes the resource a method was called on, ``(self, ...)``.
+    """
+    return args[0].__class__.__name__, args[0].name
+
+
+def describe_manager(args):
+    """
+    Describes the type of resource handled by a ``ResourceManager`` classmethod call, ``(cls, ...)``.
+    """
+    return args[0]._resource_type.__name__, None
+
+
+def describe_name(resource_type):
+    """
+    Builds a describe function for calls taking the name of a resource as their first argument.
+
+    Args:
+        resource_type (str): The type of the named resource.
+    """
+    def describe(args):
+        return resource_type, getattr(args[0], 'name', args[0]) if args else None
+    return describe
+
+
+def _run_hooks(index, span):
+    for hook in list(_hooks):
+        callback = hook[index]
+        if callback is None:
+            continue
+        try:
+            callback(span)
+        except Exception:
+            _LOG.exception('Trace Hook Failed: %r', callback)
+
+
+def instrumented(operation, qualify=False, describe=None):
+    """
+    Decorates a function so its calls are recorded by class::`_metrics` and reported to trace hooks.
+
+    While metrics are disabled and no hooks are installed, the decorated function costs one extra call and one
+    check.
+
+    Args:
+        operation (str): The name the calls are recorded under.
+        qualify (bool): If True, the name is prefixed with the name of the class passed as the first argument, so
+            a classmethod shared by several managers is recorded separately for each.
+        describe (callable): Called with the positional arguments of a traced call; returns the resource type and
+            name for its class::`Span`.
+    """
+    def decorator(func):
+        active = _active
+        qualified_names = {}
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not active[0]:
+                return func(*args, **kwargs)
+
+            name = operation
+            if qualify:
+                name = qualified_names.get(args[0])
+                if name is None:
+                    name = qualified_names[args[0]] = '{0}.{1}'.format(args[0].__name__, operation)
+
+            error = None
+            span = None
+            start = _clock()
+            if _hooks:
+                resource_type, resource_name = describe(args) if describe is not None else (None, None)
+                span = Span(name, resource_type, resource_name, start, None, threading.current_thread().ident, None)
+                _run_hooks(0, span)
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                duration = _clock() - start
+                _metrics.record_call(name, duration, error is not None)
+                if span is not None:
+                    _run_hooks(1, span._replace(duration=duration, error=error))
+        return wrapper
+    return decorator
@@ -0,0 +1,90 @@
+"""A shared pool of strings stored by many resources.
+
+Environments commonly repeat the same variable names and values, and Apps the same locations and executables.
+Routing those strings through ``intern_string`` keeps one copy of each, however many resources store it.
+
+Interning is lock free; the pool relies on ``dict.setdefault`` being atomic. Strings that nothing but the pool still
+refers to are pruned whenever the pool has doubled in size since it was last pruned, so the pool does not keep the
+strings of deleted resources alive indefinitely. Strings already stored by resources keep their identity; pruning and
+``clear`` only affect later lookups.
+
+"""
+import sys
+import threading
+
+
+# The pool is pruned once it holds more strings than this, and then whenever it has doubled since the last prune.
+_MIN_PRUNE_SIZE = 1024
+
+# References to a pooled string that only the pool holds, as counted while looping over a snapshot of the pool: the
+# pool's key and value, the snapshot, the loop variable and the argument to sys.getrefcount.
+_POOL_REFERENCES = 5
+
+_pool = {}
+_state = {'prune_size': _MIN_PRUNE_SIZE}
+_lock = threading.Lock()
+
+
+def intern_string(value):
+    """
+    Retrieves the pooled copy of a string, adding ``value`` to the pool if it has none.
+
+    Args:
+        value (unicode): The string to intern.
+
+    Returns:
+        A string equal to ``value``, shared by every caller that interned an equal string.
+    """
+    result = _pool.setdefault(value, value)
+    if result is value and len(_pool) > _state['prune_size']:
+        _prune()
+    return result
+
+
+def _prune():
+    """
+    Removes the strings that only the pool refers to.
+    """
+    with _lock:
+        if len(_pool) <= _state['prune_size']:
+            return
+        for value in list(_pool):
+            if sys.getrefcount(value) <= _POOL_REFERENCES:
+                _pool.pop(value, None)
+        _state['prune_size'] = max(_MIN_PRUNE_SIZE, 2 * len(_pool))
+
+
+def stats():
+    """
+    Reports how much storage the pool is currently deduplicating.
+
+    The figures are computed from the reference counts of the pooled strings when called, so interning itself keeps
+    no statistics.
+
+    Returns:
+        A dictionary of ``unique`` (strings in the pool), ``references`` (references to pooled strings held outside
+        the pool), ``bytes_saved`` (the size of the copies that sharing avoids) and ``dedup_ratio`` (references per
+        unique string; 1.0 means nothing is shared).
+    """
+    unique = 0
+    references = 0
+    bytes_saved = 0
+    for value in list(_pool):
+        count = sys.getrefcount(value) - _POOL_REFERENCES
+        unique += 1
+        references += count
+        if count > 1:
+            bytes_saved += (count - 1) * sys.getsizeof(value)
+    return {'unique': unique,
+            'references': references,
+            'bytes_saved': bytes_saved,
+            'dedup_ratio': float(references) / unique if unique else 1.0}
+
+
+def clear():
+    """
+    Empties the pool.
+    """
+    with _lock:
+        _pool.clear()
+        _state['prune_size'] = _MIN_PRUNE_SIZE
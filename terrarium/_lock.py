@@ -0,0 +1,114 @@
+import contextlib
+import threading
+
+try:
+    from thread import get_ident
+except ImportError:
+    from threading import get_ident
+
+
+class ReadWriteLock(object):
+    """
+    A lock allowing any number of concurrent readers or a single writer.
+
+    Writers are preferred: once a writer is waiting, new readers wait until it has finished, so a steady stream of
+    readers cannot starve writers. Both read and write locks are reentrant, and a thread holding the write lock may
+    also take the read lock. Upgrading a read lock to a write lock is not supported because two upgrading readers
+    would deadlock.
+    """
+    def __init__(self):
+        super(ReadWriteLock, self).__init__()
+
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None
+        self._writer_depth = 0
+        self._writers_waiting = 0
+        self._local = threading.local()
+
+    def acquire_read(self):
+        """
+        Blocks until the read lock is acquired.
+        """
+        local = self._local
+        depth = getattr(local, 'depth', 0)
+        if not depth:
+            with self._condition:
+                if self._writer == get_ident():
+                    local.counted = False
+                else:
+                    while self._writer is not None or self._writers_waiting:
+                        self._condition.wait()
+                    self._readers += 1
+                    local.counted = True
+        local.depth = depth + 1
+
+    def release_read(self):
+        """
+        Releases the read lock.
+        """
+        local = self._local
+        local.depth -= 1
+        if not local.depth and local.counted:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    def acquire_write(self):
+        """
+        Blocks until the write lock is acquired.
+
+        Raises:
+            RuntimeError: If the calling thread holds the read lock.
+        """
+        me = get_ident()
+        with self._condition:
+            if self._writer == me:
+                self._writer_depth += 1
+                return
+
+            if getattr(self._local, 'depth', 0):
+                raise RuntimeError('Cannot acquire a write lock while holding a read lock.')
+
+            self._writers_waiting += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._condition.wait()
+            finally:
+                self._writers_waiting -= 1
+
+            self._writer = me
+            self._writer_depth = 1
+
+    def release_write(self):
+        """
+        Releases the write lock.
+        """
+        with self._condition:
+            self._writer_depth -= 1
+            if not self._writer_depth:
+                self._writer = None
+                self._condition.notify_all()
+
+    @contextlib.contextmanager
+    def reading(self):
+        """
+        Holds the read lock for the duration of a ``with`` block.
+        """
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextlib.contextmanager
+    def writing(self):
+        """
+        Holds the write lock for the duration of a ``with`` block.
+        """
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
@@ -0,0 +1,138 @@
+"""Call counts, cache hit rates and latency histograms for Terrarium operations.
+
+Metrics are disabled by default. While disabled, and no trace hooks are installed, instrumented operations check a
+single flag and record nothing.
+
+"""
+import bisect
+import threading
+
+
+# Upper bounds of the latency histogram buckets, in seconds. Durations above the last bound fall into a final
+# overflow bucket.
+LATENCY_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2,
+                   5e-2, 0.1, 0.25, 0.5, 1.0)
+
+_state = {'enabled': False}
+_operations = {}
+_caches = {}
+_lock = threading.Lock()
+
+
+class _OperationStats(object):
+    __slots__ = ('count', 'errors', 'total', 'minimum', 'maximum', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = None
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def add(self, duration, failed):
+        self.count += 1
+        if failed:
+            self.errors += 1
+        self.total += duration
+        if self.minimum is None or duration < self.minimum:
+            self.minimum = duration
+        if self.maximum is None or duration > self.maximum:
+            self.maximum = duration
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS, duration)] += 1
+
+    def as_dict(self):
+        bounds = LATENCY_BUCKETS + (float('inf'),)
+        return {'count': self.count,
+                'errors': self.errors,
+                'total': self.total,
+                'mean': self.total / self.count if self.count else 0.0,
+                'min': self.minimum,
+                'max': self.maximum,
+                'histogram': [(bound, count) for bound, count in zip(bounds, self.buckets) if count]}
+
+
+def enable():
+    """
+    Starts recording metrics.
+    """
+    from . import _instrumentation
+    _state['enabled'] = True
+    _instrumentation._refresh()
+
+
+def disable():
+    """
+    Stops recording metrics. Recorded metrics are kept until ``reset``.
+    """
+    from . import _instrumentation
+    _state['enabled'] = False
+    _instrumentation._refresh()
+
+
+def is_enabled():
+    """
+    Returns:
+        True if metrics are being recorded.
+    """
+    return _state['enabled']
+
+
+def reset():
+    """
+    Discards every recorded metric.
+    """
+    with _lock:
+        _operations.clear()
+        _caches.clear()
+
+
+def snapshot():
+    """
+    Reports the metrics recorded since the last ``reset``.
+
+    Returns:
+        A dictionary with two keys. ``operations`` maps operation names to dictionaries of ``count``, ``errors``,
+        ``total``, ``mean``, ``min`` and ``max`` (durations in seconds) and ``histogram``, a list of
+        ``(upper_bound, count)`` pairs for the non-empty latency buckets. ``caches`` maps cache names to
+        dictionaries of ``hits`` and ``misses``.
+    """
+    with _lock:
+        operations = dict((name, stats.as_dict()) for name, stats in _operations.iteritems())
+        caches = dict((name, {'hits': hits, 'misses': misses}) for name, (hits, misses) in _caches.iteritems())
+    return {'operations': operations, 'caches': caches}
+
+
+def record_call(operation, duration, failed=False):
+    """
+    Records one call of an operation, if metrics are enabled.
+
+    Args:
+        operation (str): The name of the operation.
+        duration (float): How long the call took, in seconds.
+        failed (bool): True if the call raised an exception.
+    """
+    if not _state['enabled']:
+        return
+    with _lock:
+        stats = _operations.get(operation)
+        if stats is None:
+            stats = _operations[operation] = _OperationStats()
+        stats.add(duration, failed)
+
+
+def record_cache(cache, hit):
+    """
+    Records one lookup in a cache, if metrics are enabled.
+
+    Args:
+        cache (str): The name of the cache.
+        hit (bool): True if the lookup found a cached value.
+    """
+    if not _state['enabled']:
+        return
+    with _lock:
+        counts = _caches.get(cache)
+        if counts is None:
+            counts = _caches[cache] = [0, 0]
+        counts[0 if hit else 1] += 1
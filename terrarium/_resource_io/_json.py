@@ -5,15 +5,17 @@ from .._resource_managers import AppManager
 from .._resource_managers import EnvironmentManager
 from .._resource_managers import RuntimeProfileManager
 from .._errors import ResourceNotFoundError, ResourceAlreadyExistsError
+from .._instrumentation import describe_name, instrumented
 
 
 _LOG = logging.getLogger(__name__)
 
-_FMT_BASE_MISSING_FIELD = 'Failed to load {0} data: No "{{0}}" field found.'.format
-_FMT_BASE_NULL_DATA = 'Failed to load {0} data: No "{{0}}" field found.'.format
-_FMT_BASE_EMPTY_DATA = 'Failed to load {0} data: No "{{0}}" field found.'.format
+_MSG_MISSING_FIELD = 'Failed to load %s data: No "%s" field found.'
+_MSG_NULL_DATA = 'Failed to load %s data: No "%s" field found.'
+_MSG_EMPTY_DATA = 'Failed to load %s data: No "%s" field found.'
 
 
+@instrumented('json.import_app')
 def import_app(app_data, force=False):
     """
     Creates a managed class::`App` instance from JSON data.
@@ -32,15 +34,8 @@ def import_app(app_data, force=False):
     except TypeError:
         pass
 
-    fmt_missing_field = _FMT_BASE_MISSING_FIELD('App').format
-    fmt_null_data = _FMT_BASE_NULL_DATA('App').format
-    fmt_empty_data = _FMT_BASE_EMPTY_DATA('App').format
-
     def get_data_field(field_name):
-        return _get_data_field(app_data, field_name,
-                               fmt_missing_field=fmt_missing_field,
-                               fmt_null_data=fmt_null_data,
-                               fmt_empty_data=fmt_empty_data)
+        return _get_data_field(app_data, field_name, 'App')
 
     app_name = get_data_field('name')
     app_location = get_data_field('location')
@@ -51,7 +46,7 @@ def import_app(app_data, force=False):
         result = AppManager.create_app(app_name, app_location, app_executable, description=app_description)
     except ResourceAlreadyExistsError:
         if force:
-            _LOG.debug('Import Forced: App "{0}" already exists'.format(app_name))
+            _LOG.debug('Import Forced: App "%s" already exists', app_name)
             AppManager.update_app(app_name, new_location=app_location, new_executable=app_executable,
                                   new_description=app_description)
             result = AppManager.get_app(app_name)
@@ -64,6 +59,7 @@ def import_app(app_data, force=False):
     return result
 
 
+@instrumented('json.export_app', describe=describe_name('App'))
 def export_app(app_name):
     """
     Exports an class::`App` instance to a JSON string.
@@ -74,7 +70,7 @@ def export_app(app_name):
     Returns:
         JSON string containing class::`App` data
     """
-    _LOG.debug('Export Started: App "{0}" to JSON'.format(app_name))
+    _LOG.debug('Export Started: App "%s" to JSON', app_name)
 
     try:
         app = AppManager.get_app(app_name)
@@ -88,10 +84,11 @@ def export_app(app_name):
                 'executable': app.executable,
                 'description': app.description}
 
-    _LOG.debug('Export Complete: App "{0}" to JSON'.format(app_name))
+    _LOG.debug('Export Complete: App "%s" to JSON', app_name)
     return json.dumps(app_data)
 
 
+@instrumented('json.import_environment')
 def import_environment(environment_data, force=False):
     """
     Creates a managed class::`Environment` instance from JSON data.
@@ -110,15 +107,8 @@ def import_environment(environment_data, force=False):
     except TypeError:
         pass
 
-    fmt_missing_field = _FMT_BASE_MISSING_FIELD('Environment').format
-    fmt_null_data = _FMT_BASE_NULL_DATA('Environment').format
-    fmt_empty_data = _FMT_BASE_EMPTY_DATA('Environment').format
-
     def get_data_field(field_name):
-        return _get_data_field(environment_data, field_name,
-                               fmt_missing_field=fmt_missing_field,
-                               fmt_null_data=fmt_null_data,
-                               fmt_empty_data=fmt_empty_data)
+        return _get_data_field(environment_data, field_name, 'Environment')
 
     env_name = get_data_field('name')
     env_parent = get_data_field('parent')
@@ -130,7 +120,7 @@ def import_environment(environment_data, force=False):
                                                        description=env_description)
     except ResourceAlreadyExistsError:
         if force:
-            _LOG.debug('Import Forced: Environment "{0}" already exists'.format(env_name))
+            _LOG.debug('Import Forced: Environment "%s" already exists', env_name)
             EnvironmentManager.update_environment(env_name, new_parent=env_parent, update_variables=env_variables,
                                                   new_description=env_description)
             result = EnvironmentManager.get_environment(env_name)
@@ -143,6 +133,7 @@ def import_environment(environment_data, force=False):
     return result
 
 
+@instrumented('json.export_environment', describe=describe_name('Environment'))
 def export_environment(environment_name):
     """
     Exports an class::`Environment` instance to a JSON string.
@@ -153,7 +144,7 @@ def export_environment(environment_name):
     Returns:
         JSON string containing class::`Environment` data
     """
-    _LOG.debug('Export Started: Environment "{0}" to JSON'.format(environment_name))
+    _LOG.debug('Export Started: Environment "%s" to JSON', environment_name)
 
     try:
         env = EnvironmentManager.get_environment(environment_name)
@@ -164,13 +155,14 @@ def export_environment(environment_name):
 
     env_data = {'name': env.name,
                 'parent': env.parent,
-                'variables': env.variables,
+                'variables': dict(env.variables_view),
                 'description': env.description}
 
-    _LOG.debug('Export Complete: Environment "{0}" to JSON'.format(environment_name))
+    _LOG.debug('Export Complete: Environment "%s" to JSON', environment_name)
     return json.dumps(env_data)
 
 
+@instrumented('json.import_runtime_profile')
 def import_runtime_profile(runtime_profile_data, force=False):
     """
     Creates a managed class::`RuntimeProfile` instance from JSON data.
@@ -189,15 +181,8 @@ def import_runtime_profile(runtime_profile_data, force=False):
     except TypeError:
         pass
 
-    fmt_missing_field = _FMT_BASE_MISSING_FIELD('RuntimeProfile').format
-    fmt_null_data = _FMT_BASE_NULL_DATA('RuntimeProfile').format
-    fmt_empty_data = _FMT_BASE_EMPTY_DATA('RuntimeProfile').format
-
     def get_data_field(field_name):
-        return _get_data_field(runtime_profile_data, field_name,
-                               fmt_missing_field=fmt_missing_field,
-                               fmt_null_data=fmt_null_data,
-                               fmt_empty_data=fmt_empty_data)
+        return _get_data_field(runtime_profile_data, field_name, 'RuntimeProfile')
 
     profile_name = get_data_field('name')
     profile_app = get_data_field('app')
@@ -212,7 +197,7 @@ def import_runtime_profile(runtime_profile_data, force=False):
             description=profile_description)
     except ResourceAlreadyExistsError:
         if force:
-            _LOG.debug('Import Forced: Runtime Profile "{0}" already exists'.format(profile_name))
+            _LOG.debug('Import Forced: Runtime Profile "%s" already exists', profile_name)
             RuntimeProfileManager.update_runtime_profile(
                 profile_name, new_app=profile_app, new_environment=profile_env, new_cmd_args=profile_args,
                 new_cmd_kwargs=profile_kwargs, new_description=profile_description)
@@ -226,6 +211,7 @@ def import_runtime_profile(runtime_profile_data, force=False):
     return result
 
 
+@instrumented('json.export_runtime_profile', describe=describe_name('RuntimeProfile'))
 def export_runtime_profile(runtime_profile_name):
     """
     Exports a class::`RuntimeProfile` instance to a JSON string.
@@ -236,7 +222,7 @@ def export_runtime_profile(runtime_profile_name):
     Returns:
         JSON string containing class::`RuntimeProfile` data
     """
-    _LOG.debug('Export Started: Runtime Profile "{0}" to JSON'.format(runtime_profile_name))
+    _LOG.debug('Export Started: Runtime Profile "%s" to JSON', runtime_profile_name)
 
     try:
         profile = RuntimeProfileManager.get_runtime_profile(runtime_profile_name)
@@ -248,34 +234,31 @@ def export_runtime_profile(runtime_profile_name):
     profile_data = {'name': profile.name,
                     'app': profile.app,
                     'environment': profile.environment,
-                    'arguments': profile.arguments,
-                    'keyword_arguments': profile.keyword_arguments,
+                    'arguments': list(profile.arguments_view),
+                    'keyword_arguments': dict(profile.keyword_arguments_view),
                     'description': profile.description}
 
-    _LOG.debug('Export Complete: Runtime Profile "{0}" to JSON'.format(runtime_profile_name))
+    _LOG.debug('Export Complete: Runtime Profile "%s" to JSON', runtime_profile_name)
     return json.dumps(profile_data)
 
 
-def _get_data_field(data, field_name, fmt_missing_field=None, fmt_null_data=None, fmt_empty_data=None):
+def _get_data_field(data, field_name, resource_type_name):
     result = None
 
     try:
         result = data[field_name]
     except KeyError:
-        msg = fmt_missing_field(field_name)
-        _LOG.error(msg)
+        _LOG.error(_MSG_MISSING_FIELD, resource_type_name, field_name)
         return result
 
     if result is None:
-        msg = fmt_null_data(field_name)
-        _LOG.error(msg)
+        _LOG.error(_MSG_NULL_DATA, resource_type_name, field_name)
         return result
 
     if isinstance(result, basestring):
         result = unicode(result).strip()
     if not result:
-        msg = fmt_empty_data(field_name)
-        _LOG.error(msg)
+        _LOG.error(_MSG_EMPTY_DATA, resource_type_name, field_name)
         return None
 
     return result
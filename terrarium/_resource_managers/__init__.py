@@ -1,3 +1,7 @@
 from .app_manager import AppManager
 from .environment_manager import EnvironmentManager
 from .runtime_profile_manager import RuntimeProfileManager
+from ._query import Predicate, Equals, In, Matches, AllOf, AnyOf
+from ._resource_manager import set_thread_safe, is_thread_safe, dependents_of
+from ._events import (ResourceEvent, ResourceCreated, ResourceUpdated, ResourceRenamed, ResourceDeleted,
+                      subscribe, unsubscribe, batch_events)
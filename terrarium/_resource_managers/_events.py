@@ -0,0 +1,179 @@
+import collections
+import contextlib
+import logging
+import threading
+
+
+_LOG = logging.getLogger(__name__)
+
+_subscribers = []
+_batch_state = threading.local()
+_dispatch_state = threading.local()
+
+
+class ResourceEvent(collections.namedtuple('ResourceEvent', ('manager', 'resource', 'name', 'old_name'))):
+    """
+    Base class for notifications of changes to managed resources.
+
+    Attributes:
+        manager: The class::`ResourceManager` subclass managing the resource.
+        resource: The resource that changed.
+        name (str): The name of the resource after the change, or its last name if it was deleted.
+        old_name (str): The name of the resource before a rename, otherwise None.
+    """
+    __slots__ = ()
+
+
+class ResourceCreated(ResourceEvent):
+    """A resource was created."""
+    __slots__ = ()
+
+
+class ResourceUpdated(ResourceEvent):
+    """Attributes of a resource changed. Its name did not."""
+    __slots__ = ()
+
+
+class ResourceRenamed(ResourceEvent):
+    """A resource was renamed. Other attributes may also have changed."""
+    __slots__ = ()
+
+
+class ResourceDeleted(ResourceEvent):
+    """A resource was deleted."""
+    __slots__ = ()
+
+
+def subscribe(callback, manager=None, event_types=None):
+    """
+    Registers a callable to be notified of changes to managed resources.
+
+    When the managers are thread safe, subscribers are called once the change is complete and the managers' lock
+    is released, so they may use the managers themselves.
+
+    Args:
+        callback (callable): Called with each class::`ResourceEvent`.
+        manager: Only notify of changes made through this class::`ResourceManager` subclass. All managers if None.
+        event_types ([type]): Only notify of these class::`ResourceEvent` subclasses. All events if None.
+
+    Returns:
+        ``callback``, so subscribe can be used as a decorator.
+    """
+    event_types = tuple(event_types) if event_types is not None else (ResourceEvent,)
+    _subscribers.append((callback, manager, event_types))
+    return callback
+
+
+def unsubscribe(callback):
+    """
+    Stops notifying a callable registered with ``subscribe``.
+
+    Args:
+        callback (callable): A subscribed callable. Every subscription it holds is removed.
+    """
+    _subscribers[:] = [s for s in _subscribers if s[0] != callback]
+
+
+@contextlib.contextmanager
+def batch_events():
+    """
+    Coalesces notifications made by the current thread for the duration of a ``with`` block.
+
+    Each changed resource produces at most one event when the outermost block exits. A resource that was created
+    and then changed produces class::`ResourceCreated`. One that was created and deleted produces nothing. Renames
+    combine into a single class::`ResourceRenamed` from the first name to the last. Blocks may be nested.
+    """
+    depth = getattr(_batch_state, 'depth', 0)
+    if not depth:
+        _batch_state.pending = collections.OrderedDict()
+    _batch_state.depth = depth + 1
+    try:
+        yield
+    finally:
+        _batch_state.depth = depth
+        if not depth:
+            pending = _batch_state.pending
+            _batch_state.pending = None
+            for change in pending.itervalues():
+                event = _coalesce(*change)
+                if event is not None:
+                    _publish(event)
+
+
+def _coalesce(manager, resource, created, deleted, first_name, last_name):
+    if created:
+        if deleted:
+            return None
+        return ResourceCreated(manager, resource, last_name, None)
+    if deleted:
+        return ResourceDeleted(manager, resource, first_name, None)
+    if first_name != last_name:
+        return ResourceRenamed(manager, resource, last_name, first_name)
+    return ResourceUpdated(manager, resource, last_name, None)
+
+
+def _notify(event_type, manager, resource, name, old_name=None):
+    """
+    Publishes a change to subscribers, or records it if the current thread is batching events.
+    """
+    if not _subscribers:
+        return
+
+    pending = getattr(_batch_state, 'pending', None)
+    if pending is None:
+        _publish(event_type(manager, resource, name, old_name))
+        return
+
+    key = (manager, id(resource))
+    change = pending.get(key)
+    if change is None:
+        first_name = old_name if old_name is not None else name
+        change = [manager, resource, False, False, first_name, name]
+        pending[key] = change
+
+    if event_type is ResourceCreated:
+        change[2] = True
+    elif event_type is ResourceDeleted:
+        change[3] = True
+    change[5] = name
+
+
+def _defer_events():
+    """
+    Holds back events published by the current thread until the matching ``_dispatch_events``. Calls may be nested.
+    """
+    _dispatch_state.depth = getattr(_dispatch_state, 'depth', 0) + 1
+
+
+def _dispatch_events():
+    """
+    Ends a ``_defer_events``. Leaving the outermost one delivers the events held back, in order.
+    """
+    depth = _dispatch_state.depth - 1
+    _dispatch_state.depth = depth
+    if not depth:
+        queued = getattr(_dispatch_state, 'queued', None)
+        if queued:
+            _dispatch_state.queued = None
+            for event in queued:
+                _deliver(event)
+
+
+def _publish(event):
+    if not getattr(_dispatch_state, 'depth', 0):
+        _deliver(event)
+        return
+
+    queued = getattr(_dispatch_state, 'queued', None)
+    if queued is None:
+        queued = _dispatch_state.queued = []
+    queued.append(event)
+
+
+def _deliver(event):
+    for callback, manager, event_types in list(_subscribers):
+        if (manager is None or manager is event.manager) and isinstance(event, event_types):
+            try:
+                callback(event)
+            except Exception:
+                _LOG.exception('Notification Failed: %r', callback)
@@ -0,0 +1,321 @@
+import re
+import sre_constants
+import sre_parse
+
+from .._cache import LRUCache
+
+
+_PATTERN_CACHE_SIZE = 256
+
+_pattern_cache = LRUCache(_PATTERN_CACHE_SIZE)
+
+
+def _compile_pattern(pattern):
+    """
+    Compiles a regex pattern and works out which strings it can match with ``re.match``.
+
+    Args:
+        pattern (str): A regex pattern.
+
+    Returns:
+        A tuple of the compiled regex, the literal prefix every match must start with, and whether
+        every string starting with that prefix is a match.
+    """
+    result = _pattern_cache.get(pattern)
+    if result is None:
+        regex = re.compile(pattern)
+        prefix, complete = _get_literal_prefix(pattern)
+        result = (regex, prefix, complete)
+        _pattern_cache.set(pattern, result)
+    return result
+
+
+def _get_literal_prefix(pattern):
+    try:
+        parsed = sre_parse.parse(pattern)
+    except (sre_constants.error, TypeError):
+        return u'', False
+
+    if parsed.pattern.flags & sre_parse.SRE_FLAG_IGNORECASE:
+        return u'', False
+
+    items = list(parsed)
+    index = 0
+
+    while index < len(items) and items[index] == (sre_constants.AT, sre_constants.AT_BEGINNING):
+        index += 1
+
+    prefix = []
+    while index < len(items) and items[index][0] == sre_constants.LITERAL:
+        prefix.append(unichr(items[index][1]))
+        index += 1
+
+    complete = all(op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT) and av[0] == 0
+                   for op, av in items[index:])
+
+    return u''.join(prefix), complete
+
+
+def _normalize(value):
+    if value is None:
+        return value
+    return unicode(value).strip()
+
+
+class _NameRange(object):
+    """
+    A range of a manager's sorted names, read only when iterated.
+    """
+    def __init__(self, names, start, stop):
+        super(_NameRange, self).__init__()
+
+        self._names = names
+        self._start = start
+        self._stop = stop
+
+    def __iter__(self):
+        names = self._names
+        return (names[index] for index in xrange(self._start, self._stop))
+
+
+class _NameUnion(object):
+    """
+    The union of several groups of candidate names, computed only when iterated.
+    """
+    def __init__(self, groups):
+        super(_NameUnion, self).__init__()
+
+        self._groups = groups
+
+    def __iter__(self):
+        seen = set()
+        for group in self._groups:
+            for name in group:
+                if name not in seen:
+                    seen.add(name)
+                    yield name
+
+
+class Predicate(object):
+    """
+    Base class for resource query predicates.
+
+    Predicates test a single resource through ``matches`` and describe how a manager can find candidate
+    resources through ``plan``. Predicates combine with ``&`` into class::`AllOf` and with ``|`` into
+    class::`AnyOf`. They are immutable and hashable, so query results can be cached.
+    """
+    def matches(self, resource):
+        """
+        Tests a resource against the predicate.
+
+        Args:
+            resource: A managed resource.
+
+        Returns:
+            True if the resource satisfies the predicate.
+        """
+        raise NotImplementedError
+
+    def plan(self, manager):
+        """
+        Chooses how ``manager`` should gather candidate resources for the predicate.
+
+        Args:
+            manager: A class::`ResourceManager` subclass.
+
+        Planning only estimates costs. The candidate names are read when they are iterated, which
+        must happen before the manager changes.
+
+        Returns:
+            A tuple of the estimated number of candidates, an iterable of the candidate resource names
+            or None if every resource must be scanned, and whether every candidate is known to satisfy
+            the predicate.
+        """
+        return len(manager._resource_collection), None, False
+
+    def _key(self):
+        raise NotImplementedError
+
+    def __and__(self, other):
+        return AllOf(self, other)
+
+    def __or__(self, other):
+        return AnyOf(self, other)
+
+    def __eq__(self, other):
+        return self.__class__ is other.__class__ and self._key() == other._key()
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash((self.__class__, self._key()))
+
+    def __repr__(self):
+        return '{0}{1!r}'.format(self.__class__.__name__, self._key())
+
+
+class Equals(Predicate):
+    """
+    Matches resources whose attribute equals a value exactly.
+
+    Answered from the manager's name lookup or attribute indexes where available.
+    """
+    def __init__(self, attribute, value):
+        """
+        Args:
+            attribute (str): The name of a resource attribute.
+            value (basestring): The value to match. Surrounding whitespace is ignored.
+        """
+        super(Equals, self).__init__()
+
+        self._attribute = attribute
+        self._value = _normalize(value)
+
+    def matches(self, resource):
+        return getattr(resource, self._attribute) == self._value
+
+    def plan(self, manager):
+        if self._attribute == 'name':
+            names = (self._value,) if self._value in manager._resource_collection else ()
+        elif self._attribute in manager._indexed_attributes:
+            names = manager._indexes.get(self._attribute, {}).get(self._value, ())
+        else:
+            return super(Equals, self).plan(manager)
+        return len(names), names, True
+
+    def _key(self):
+        return self._attribute, self._value
+
+
+class In(Predicate):
+    """
+    Matches resources whose attribute equals any one of several values.
+
+    Answered from the manager's name lookup or attribute indexes where available.
+    """
+    def __init__(self, attribute, values):
+        """
+        Args:
+            attribute (str): The name of a resource attribute.
+            values ([basestring]): The values to match. Surrounding whitespace is ignored.
+        """
+        super(In, self).__init__()
+
+        self._attribute = attribute
+        self._values = frozenset(_normalize(value) for value in values)
+
+    def matches(self, resource):
+        return getattr(resource, self._attribute) in self._values
+
+    def plan(self, manager):
+        if self._attribute != 'name' and self._attribute not in manager._indexed_attributes:
+            return super(In, self).plan(manager)
+
+        cost = 0
+        groups = []
+        for value in self._values:
+            value_cost, names, _ = Equals(self._attribute, value).plan(manager)
+            cost += value_cost
+            groups.append(names)
+        return cost, _NameUnion(groups), True
+
+    def _key(self):
+        return self._attribute, tuple(sorted(self._values))
+
+
+class Matches(Predicate):
+    """
+    Matches resources whose attribute matches a regex pattern, using ``re.match``.
+
+    Name patterns that begin with literal text are answered from the manager's sorted name index.
+    """
+    def __init__(self, attribute, pattern):
+        """
+        Args:
+            attribute (str): The name of a resource attribute.
+            pattern (basestring): A regex pattern. Surrounding whitespace is ignored.
+        """
+        super(Matches, self).__init__()
+
+        self._attribute = attribute
+        self._pattern = _normalize(pattern)
+        self._regex, self._prefix, self._complete = _compile_pattern(self._pattern)
+
+    def matches(self, resource):
+        value = getattr(resource, self._attribute)
+        return value is not None and self._regex.match(value) is not None
+
+    def plan(self, manager):
+        if self._attribute == 'name' and self._prefix:
+            start, stop = manager._get_prefix_range(self._prefix)
+            return stop - start, _NameRange(manager._sorted_names, start, stop), self._complete
+        return super(Matches, self).plan(manager)
+
+    def _key(self):
+        return self._attribute, self._pattern
+
+
+class AllOf(Predicate):
+    """
+    Matches resources satisfying every one of several predicates.
+
+    Candidates come from the most selective child predicate; the remaining children filter them.
+    """
+    def __init__(self, *predicates):
+        """
+        Args:
+            *predicates (class::`Predicate`): The predicates to combine.
+        """
+        super(AllOf, self).__init__()
+
+        self._predicates = tuple(predicates)
+
+    def matches(self, resource):
+        return all(predicate.matches(resource) for predicate in self._predicates)
+
+    def plan(self, manager):
+        best = None
+        for predicate in self._predicates:
+            cost, names, exact = predicate.plan(manager)
+            if names is not None and (best is None or cost < best[0]):
+                best = (cost, names, exact and len(self._predicates) == 1)
+        return best or super(AllOf, self).plan(manager)
+
+    def _key(self):
+        return self._predicates
+
+
+class AnyOf(Predicate):
+    """
+    Matches resources satisfying at least one of several predicates.
+
+    Candidates are the union of the children's candidates, unless any child requires a full scan.
+    """
+    def __init__(self, *predicates):
+        """
+        Args:
+            *predicates (class::`Predicate`): The predicates to combine.
+        """
+        super(AnyOf, self).__init__()
+
+        self._predicates = tuple(predicates)
+
+    def matches(self, resource):
+        return any(predicate.matches(resource) for predicate in self._predicates)
+
+    def plan(self, manager):
+        cost = 0
+        groups = []
+        exact = True
+        for predicate in self._predicates:
+            child_cost, child_names, child_exact = predicate.plan(manager)
+            if child_names is None:
+                return super(AnyOf, self).plan(manager)
+            cost += child_cost
+            groups.append(child_names)
+            exact = exact and child_exact
+        return cost, _NameUnion(groups), exact
+
+    def _key(self):
+        return self._predicates
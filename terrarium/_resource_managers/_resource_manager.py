@@ -1,12 +1,123 @@
+import bisect
+import collections
+import contextlib
+import functools
+import heapq
 import logging
 import operator
-import re
+import sys
 
+from .._cache import LRUCache
 from .._errors import *
+from .._instrumentation import describe_managed_resource, describe_manager, instrumented
+from .._lock import ReadWriteLock
+from .._metrics import record_cache
+from ._events import (ResourceCreated, ResourceDeleted, ResourceRenamed, ResourceUpdated, _defer_events,
+                      _dispatch_events, _notify)
+from ._query import AllOf, Matches
 
 
 _LOG = logging.getLogger(__name__)
 
+_SEARCH_CACHE_SIZE = 256
+
+_search_cache = LRUCache(_SEARCH_CACHE_SIZE)
+
+_lock_state = {'lock': None}
+
+
+def set_thread_safe(enabled):
+    """
+    Turns locking of the resource managers on or off.
+
+    When enabled, every manager shares a single class::`ReadWriteLock`. Reads such as ``get_*`` and ``find_*``
+    run concurrently. Creates, updates, renames and deletes run one at a time and are never observed half
+    applied. Their events are delivered to subscribers after the lock is released. Locking is off by default so
+    single threaded use pays nothing for it.
+
+    Args:
+        enabled (bool): True to lock the managers.
+    """
+    if not enabled:
+        _lock_state['lock'] = None
+    elif _lock_state['lock'] is None:
+        _lock_state['lock'] = ReadWriteLock()
+
+
+def is_thread_safe():
+    """
+    Returns:
+        True if the resource managers are locked for concurrent use.
+    """
+    return _lock_state['lock'] is not None
+
+
+@contextlib.contextmanager
+def _read_lock():
+    lock = _lock_state['lock']
+    if lock is None:
+        yield
+        return
+    lock.acquire_read()
+    try:
+        yield
+    finally:
+        lock.release_read()
+
+
+def dependents_of(resource):
+    """
+    Computes a list of the managed resources that refer to a resource by name.
+
+    class::`RuntimeProfile` instances depend on their class::`App` and class::`Environment`, and
+    class::`Environment` instances depend on their parent. The lookup uses the managers' attribute
+    indexes, so it costs time proportional to the number of dependents.
+
+    Args:
+        resource: A managed resource.
+
+    Returns:
+        List of resources, grouped by manager and sorted by name.
+    """
+    for manager in ResourceManager.__subclasses__():
+        if isinstance(resource, manager._resource_type):
+            return manager._get_dependents(resource.name)
+    return []
+
+
+def _reads(func):
+    @functools.wraps(func)
+    def wrapper(cls, *args, **kwargs):
+        lock = _lock_state['lock']
+        if lock is None:
+            return func(cls, *args, **kwargs)
+        lock.acquire_read()
+        try:
+            return func(cls, *args, **kwargs)
+        finally:
+            lock.release_read()
+    return wrapper
+
+
+def _writes(func):
+    @functools.wraps(func)
+    def wrapper(cls, *args, **kwargs):
+        lock = _lock_state['lock']
+        if lock is None:
+            return func(cls, *args, **kwargs)
+        lock.acquire_write()
+        _defer_events()
+        try:
+            return func(cls, *args, **kwargs)
+        finally:
+            lock.release_write()
+            _dispatch_events()
+    return wrapper
+
+
+def _get_trigrams(text):
+    return set(text[i:i + 3] for i in xrange(len(text) - 2))
+
 
 class ResourceManager(object):
     """
@@ -16,12 +127,49 @@ class ResourceManager(object):
 
     Inheritance was chosen over composition for Managers to facilitate tailored argumentation
     for a
+
+    Subclasses may list attributes in ``_indexed_attributes``. The manager maintains an index of
+    resource names by the value of each of those attributes, so exact-match queries do not scan
+    the collection.
+
+    Resource names are also kept in sorted order. Name searches whose pattern starts with literal
+    text only examine the names in the matching range.
+
+    Queries are built from predicates in class::`_query`. The most selective predicate with an
+    index supplies the candidates and the rest of the query filters them.
+
+    Subclasses may list text attributes in ``_search_attributes``. The manager maintains a
+    case-insensitive trigram index over those attributes to answer substring searches.
+
+    Managers whose resources are referred to by name from other resources register the referring
+    manager and attribute with ``_register_dependent``. Renames and deletes can then cascade to the
+    dependents, found through the referring manager's attribute index.
+
+    Every create, update, rename and delete is published to subscribers registered with
+    ``subscribe``.
+
+    The manager owns changes to its resources. The indexes and cached query results are only
+    updated by the manager's own methods, so attributes of a managed resource should be changed
+    through ``update_*`` or ``update_many``. After setting attributes of managed resources directly,
+    call ``reindex`` before searching.
+
+    See ``set_thread_safe`` for sharing the managers between threads.
     """
     _resource_type = None
     _resource_collection = {}
     _resource_update_handlers = {}
+    _generation = 0
+    _indexed_attributes = ()
+    _indexes = {}
+    _sorted_names = []
+    _search_attributes = ()
+    _trigram_index = {}
+    _resource_trigrams = {}
+    _dependents = ()
 
     @classmethod
+    @instrumented('create', qualify=True, describe=describe_managed_resource)
+    @_writes
     def _create_resource(cls, name, *args, **kwargs):
         resource_type_name = cls._resource_type.__name__
 
@@ -30,7 +178,7 @@ class ResourceManager(object):
             _LOG.error(msg)
             raise ResourceAlreadyExistsError(msg)
         else:
-            _LOG.debug('Creation Started: New {0}'.format(resource_type_name))
+            _LOG.debug('Creation Started: New %s', resource_type_name)
 
         try:
             resource = cls._resource_type(name, *args, **kwargs)
@@ -40,11 +188,18 @@ class ResourceManager(object):
             raise ResourceCreationError(msg)
         else:
             cls._resource_collection[name] = resource
+            cls._index_resource(name, resource)
+            bisect.insort(cls._sorted_names, name)
+            cls._generation += 1
+            cls._names_changed((name,))
+            _notify(ResourceCreated, cls, resource, name)
 
-        _LOG.debug('Creation Complete: {0} "{1}"'.format(resource_type_name, name))
+        _LOG.debug('Creation Complete: %s "%s"', resource_type_name, name)
         return resource
 
     @classmethod
+    @instrumented('get', qualify=True, describe=describe_managed_resource)
+    @_reads
     def _get_resource(cls, resource_name):
         resource_type_name = cls._resource_type.__name__
 
@@ -55,97 +210,739 @@ class ResourceManager(object):
             _LOG.error(msg)
             raise ResourceNotFoundError(msg)
         else:
-            _LOG.debug('Retrieval Complete: {0} "{1}"'.format(resource_type_name, resource_name))
+            _LOG.debug('Retrieval Complete: %s "%s"', resource_type_name, resource_name)
 
         return result
 
     @classmethod
-    def _update_resource(cls, resource_name, **update_values):
+    @instrumented('update', qualify=True, describe=describe_managed_resource)
+    @_writes
+    def _update_resource(cls, resource_name, cascade=False, **update_values):
         resource_type_name = cls._resource_type.__name__
 
+        batch = cls._prepare_updates([(resource_name, update_values)])
+        resource = batch[0][1]
+
+        _LOG.debug('Update Started: %s "%s"', resource_type_name, resource_name)
+
         try:
-            resource = cls._resource_collection[resource_name]
-        except KeyError:
-            msg = 'Update Failed: {0} "{1}" not found.'.format(resource_type_name, resource_name)
+            orig_values = cls._apply_updates(batch)
+        except Exception as e:
+            msg = 'Update Failed: {0} "{1}" - {2}'.format(resource_type_name, resource_name, e)
             _LOG.error(msg)
-            raise ResourceNotFoundError(msg)
+            raise ResourceUpdateError(msg)
 
-        _LOG.debug('Update Started: {0} "{1}"'.format(resource_type_name, resource_name))
+        cascaded = []
+        if cascade and resource.name != resource_name:
+            try:
+                for manager, attribute in cls._dependents:
+                    names = sorted(manager._indexes.get(attribute, {}).get(resource_name, ()))
+                    if names:
+                        dependents = manager._prepare_updates([(name, {attribute: resource.name}) for name in names])
+                        cascaded.append((manager, dependents, manager._apply_updates(dependents)))
+            except Exception as e:
+                for manager, dependents, dependent_values in reversed(cascaded):
+                    manager._revert_updates(dependents, dependent_values)
+                cls._revert_updates(batch, orig_values)
+
+                msg = 'Update Failed: {0} "{1}" - {2}'.format(resource_type_name, resource_name, e)
+                _LOG.error(msg)
+                raise ResourceUpdateError(msg)
+
+        cls._commit_updates(batch)
+        for manager, dependents, _ in cascaded:
+            manager._commit_updates(dependents)
+
+        cls._publish_updates(batch)
+        for manager, dependents, _ in cascaded:
+            manager._publish_updates(dependents)
+
+        _LOG.debug('Update Complete: %s "%s"', resource_type_name, resource_name)
+
+    @classmethod
+    @instrumented('delete', qualify=True, describe=describe_managed_resource)
+    @_writes
+    def _delete_resource(cls, resource_name, cascade=False):
+        resource_type_name = cls._resource_type.__name__
 
-        orig_values = {}
         try:
-            for property_name, new_value in update_values.iteritems():
-                try:
-                    orig_value = getattr(resource, property_name)
-                    orig_values[property_name] = orig_value
-                except AttributeError:
-                    msg = 'Update Failed: {0} "{1}.{2}" not found.'.format(resource_type_name, resource_name,
-                                                                           property_name)
+            resource = cls._resource_collection.pop(resource_name)
+        except KeyError:
+            _LOG.debug('Delete Failed: %s "%s" not found.', resource_type_name, resource_name)
+        else:
+            dependents = cls._collect_dependents(resource_name) if cascade else {}
+
+            cls._unindex_resource(resource_name, resource)
+            cls._remove_sorted_name(resource_name)
+            cls._generation += 1
+            cls._names_changed((resource_name,))
+            _notify(ResourceDeleted, cls, resource, resource_name)
+            _LOG.debug('Delete Complete: %s "%s"', resource_type_name, resource_name)
+
+            for manager, names in dependents.iteritems():
+                manager.delete_many(sorted(names))
+
+    @classmethod
+    @instrumented('create_many', qualify=True, describe=describe_manager)
+    @_writes
+    def create_many(cls, specs):
+        """
+        Creates several resources at once.
+
+        The whole batch is validated and every resource is constructed before any is added, so
+        either every resource is created or none are. The indexes are updated and the manager's
+        generation is bumped once for the batch.
+
+        Args:
+            specs ([dict]): Keyword arguments for each resource, as accepted by the subclass's
+                ``create_*`` method. Each must include ``name``.
+
+        Returns:
+            List of the created resources, in the order of ``specs``.
+        """
+        resource_type_name = cls._resource_type.__name__
+        specs = [dict(spec) for spec in specs]
+
+        _LOG.debug('Batch Creation Started: %d %s resources', len(specs), resource_type_name)
+
+        names = set()
+        resources = []
+        for spec in specs:
+            name = spec.get('name')
+            if name in cls._resource_collection or name in names:
+                msg = 'Creation Failed: {0} "{1}" already exists.'.format(resource_type_name, name)
+                _LOG.error(msg)
+                raise ResourceAlreadyExistsError(msg)
+            names.add(name)
+
+            try:
+                resources.append((name, cls._resource_type(**spec)))
+            except (TypeError, ValueError) as e:
+                msg = 'Creation Failed: {0}'.format(e)
+                _LOG.error(msg)
+                raise ResourceCreationError(msg)
+
+        for name, resource in resources:
+            cls._resource_collection[name] = resource
+            cls._index_resource(name, resource)
+        cls._sorted_names.extend(names)
+        cls._sorted_names.sort()
+        cls._generation += 1
+        cls._names_changed(names)
+
+        for name, resource in resources:
+            _notify(ResourceCreated, cls, resource, name)
+
+        _LOG.debug('Batch Creation Complete: %d %s resources', len(resources), resource_type_name)
+        return [resource for _, resource in resources]
+
+    @classmethod
+    @instrumented('update_many', qualify=True, describe=describe_manager)
+    @_writes
+    def update_many(cls, updates):
+        """
+        Updates several resources at once.
+
+        Every resource and attribute is checked before anything changes. If any value is rejected,
+        or the batch would give two resources the same name, every change in the batch is reverted.
+        The indexes are updated and the manager's generation is bumped once for the batch.
+
+        Args:
+            updates ([(str, dict)]): Resource names, each with a mapping of attribute names to new
+                values, e.g. ``('Maya', {'location': '%MAYA_ROOT%'})``.
+        """
+        resource_type_name = cls._resource_type.__name__
+        batch = cls._prepare_updates(updates)
+
+        _LOG.debug('Batch Update Started: %d %s resources', len(batch), resource_type_name)
+
+        try:
+            cls._apply_updates(batch)
+        except Exception as e:
+            msg = 'Update Failed: {0} batch - {1}'.format(resource_type_name, e)
+            _LOG.error(msg)
+            raise ResourceUpdateError(msg)
+
+        cls._commit_updates(batch)
+        cls._publish_updates(batch)
+
+        _LOG.debug('Batch Update Complete: %d %s resources', len(batch), resource_type_name)
+
+    @classmethod
+    @instrumented('delete_many', qualify=True, describe=describe_manager)
+    @_writes
+    def delete_many(cls, names):
+        """
+        Deletes several resources at once.
+
+        Names that are not managed are skipped, as with the single ``delete_*`` methods. The indexes
+        are updated and the manager's generation is bumped once for the batch.
+
+        Args:
+            names ([str]): Names of resources to delete.
+        """
+        resource_type_name = cls._resource_type.__name__
+
+        deleted = collections.OrderedDict()
+        for name in names:
+            resource = cls._resource_collection.pop(name, None)
+            if resource is not None:
+                cls._unindex_resource(name, resource)
+                deleted[name] = resource
+
+        if deleted:
+            cls._sorted_names[:] = [n for n in cls._sorted_names if n not in deleted]
+            cls._generation += 1
+            cls._names_changed(deleted)
+
+        for name, resource in deleted.iteritems():
+            _notify(ResourceDeleted, cls, resource, name)
+
+        _LOG.debug('Batch Delete Complete: %d %s resources', len(deleted), resource_type_name)
+
+    @classmethod
+    @instrumented('reindex', qualify=True, describe=describe_manager)
+    @_writes
+    def reindex(cls):
+        """
+        Rebuilds the indexes from the current attribute values of the managed resources.
+
+        Only needed after attributes of managed resources were set directly rather than through the
+        manager. Resources stay managed under the names they had; renames must go through the
+        manager.
+        """
+        cls._indexes.clear()
+        cls._trigram_index.clear()
+        cls._resource_trigrams.clear()
+        for name, resource in cls._resource_collection.iteritems():
+            cls._index_resource(name, resource)
+        cls._sorted_names[:] = sorted(cls._resource_collection)
+        cls._generation += 1
+
+        _LOG.debug('Reindex Complete: %d %s resources', len(cls._resource_collection), cls._resource_type.__name__)
+
+    @classmethod
+    def _names_changed(cls, names):
+        """
+        Called after resources are created, renamed or deleted, with the names that were added or removed.
+
+        Subclasses whose resources look each other up by name override this to discard derived data.
+
+        Args:
+            names (iterable): The affected resource names.
+        """
+        pass
+
+    @classmethod
+    def _register_dependent(cls, manager, attribute):
+        """
+        Records that resources of another manager refer to this manager's resources by name.
+
+        Args:
+            manager: The referring class::`ResourceManager` subclass.
+            attribute (str): The referring attribute. Must be one of ``manager``'s ``_indexed_attributes``.
+        """
+        cls._dependents += ((manager, attribute),)
+
+    @classmethod
+    @_reads
+    def _get_dependents(cls, resource_name):
+        """
+        Computes a list of the managed resources referring to one of this manager's resources.
+
+        Args:
+            resource_name (str): The name of a resource.
+
+        Returns:
+            List of resources, grouped by manager and sorted by name.
+        """
+        result = []
+        for manager, attribute in cls._dependents:
+            names = manager._indexes.get(attribute, {}).get(resource_name, ())
+            result.extend(manager._resource_collection[name] for name in sorted(names))
+        return result
+
+    @classmethod
+    def _prepare_updates(cls, updates):
+        """
+        Checks that every resource and attribute of a batch of updates exists.
+
+        Args:
+            updates ([(str, dict)]): Resource names, each with a mapping of attribute names to new values.
+
+        Returns:
+            List of (name, resource, values) tuples.
+        """
+        resource_type_name = cls._resource_type.__name__
+
+        batch = []
+        names = set()
+        for name, values in updates:
+            try:
+                resource = cls._resource_collection[name]
+            except KeyError:
+                msg = 'Update Failed: {0} "{1}" not found.'.format(resource_type_name, name)
+                _LOG.error(msg)
+                raise ResourceNotFoundError(msg)
+
+            if name in names:
+                msg = 'Update Failed: {0} "{1}" appears more than once.'.format(resource_type_name, name)
+                _LOG.error(msg)
+                raise ResourceUpdateError(msg)
+
+            for property_name in values:
+                if not hasattr(resource, property_name):
+                    msg = 'Update Failed: {0} "{1}.{2}" not found.'.format(resource_type_name, name, property_name)
                     _LOG.error(msg)
                     raise ResourceAttributeNotFoundError(msg)
 
-                setattr(resource, property_name, new_value)
+            names.add(name)
+            batch.append((name, resource, dict(values)))
+        return batch
 
-                msg = 'Updated {0} "{0}.{1}": "{2}"'.format(resource_type_name, resource_name, property_name, new_value)
-                _LOG.debug(msg)
-        except Exception as e:
+    @classmethod
+    def _apply_updates(cls, batch):
+        """
+        Sets the new values of a batch from ``_prepare_updates`` on its resources.
+
+        The resources are left out of the indexes until ``_commit_updates`` or ``_revert_updates``. If a value is
+        rejected, or the batch would give two resources the same name, the batch is reverted and the error raised.
+
+        Returns:
+            List of dictionaries of the original values, one per resource, for ``_revert_updates``.
+        """
+        resource_type_name = cls._resource_type.__name__
+
+        for name, resource, _ in batch:
+            cls._unindex_resource(name, resource)
+
+        applied = []
+        try:
+            for name, resource, values in batch:
+                orig_values = {}
+                applied.append(orig_values)
+                for property_name, new_value in values.iteritems():
+                    orig_values[property_name] = getattr(resource, property_name)
+                    setattr(resource, property_name, new_value)
+                    _LOG.debug('Updated %s "%s.%s": "%s"', resource_type_name, name, property_name, new_value)
+
+            names = set(name for name, _, _ in batch)
+            new_names = set()
+            for _, resource, _ in batch:
+                new_name = resource.name
+                if new_name in new_names or (new_name in cls._resource_collection and new_name not in names):
+                    raise ValueError('{0} "{1}" already exists.'.format(resource_type_name, new_name))
+                new_names.add(new_name)
+        except Exception:
+            cls._revert_updates(batch, applied)
+            raise
+
+        return applied
+
+    @classmethod
+    def _revert_updates(cls, batch, applied):
+        """
+        Restores the original values of a batch passed to ``_apply_updates`` and indexes it under its old names.
+        """
+        resource_type_name = cls._resource_type.__name__
+
+        for (name, resource, _), orig_values in reversed(zip(batch, applied)):
             for property_name, orig_value in orig_values.iteritems():
                 setattr(resource, property_name, orig_value)
-                msg = 'Reverted {0} "{0}.{1}": "{2}"'.format(resource_type_name, resource_name, property_name,
-                                                             orig_value)
-                _LOG.debug(msg)
+                _LOG.debug('Reverted %s "%s.%s": "%s"', resource_type_name, name, property_name, orig_value)
 
-            if isinstance(e, ResourceAttributeNotFoundError):
-                raise
+        for name, resource, _ in batch:
+            cls._index_resource(name, resource)
 
-            msg = 'Update Failed: {0} "{1}" - {2}'.format(resource_type_name, resource_name, e)
+    @classmethod
+    def _commit_updates(cls, batch):
+        """
+        Files the resources of a batch passed to ``_apply_updates`` under their new names and indexes them.
+        """
+        renamed = [(name, resource) for name, resource, _ in batch if resource.name != name]
+        for name, _ in renamed:
+            del cls._resource_collection[name]
+        for _, resource in renamed:
+            cls._resource_collection[resource.name] = resource
+
+        for _, resource, _ in batch:
+            cls._index_resource(resource.name, resource)
+
+        if renamed:
+            old_names = set(name for name, _ in renamed)
+            cls._sorted_names[:] = sorted([n for n in cls._sorted_names if n not in old_names] +
+                                          [resource.name for _, resource in renamed])
+            cls._names_changed(old_names.union(resource.name for _, resource in renamed))
+        cls._generation += 1
+
+    @classmethod
+    def _publish_updates(cls, batch):
+        """
+        Publishes the changes of a batch committed by ``_commit_updates``.
+        """
+        for name, resource, _ in batch:
+            if resource.name != name:
+                _notify(ResourceRenamed, cls, resource, resource.name, name)
+            else:
+                _notify(ResourceUpdated, cls, resource, name)
+
+    @classmethod
+    def _collect_dependents(cls, resource_name):
+        """
+        Finds the managed resources referring to one of this manager's resources, directly or through other
+        dependents.
+
+        Args:
+            resource_name (str): The name of a resource.
+
+        Returns:
+            OrderedDict of the dependent resource names, a set per class::`ResourceManager` subclass.
+        """
+        result = collections.OrderedDict()
+        pending = [(cls, (resource_name,))]
+        while pending:
+            manager, names = pending.pop()
+            for dependent_manager, attribute in manager._dependents:
+                index = dependent_manager._indexes.get(attribute, {})
+                new_names = set()
+                for name in names:
+                    new_names.update(index.get(name, ()))
+                new_names.difference_update(result.get(dependent_manager, ()))
+                if new_names:
+                    result.setdefault(dependent_manager, set()).update(new_names)
+                    pending.append((dependent_manager, new_names))
+        return result
+
+    @classmethod
+    def _lookup_resource(cls, resource_name):
+        """
+        Retrieves a managed resource without logging or raising if it does not exist.
+
+        Args:
+            resource_name (str): The name of a resource.
+
+        Returns:
+            The resource or None.
+        """
+        return cls._resource_collection.get(resource_name)
+
+    @classmethod
+    def _index_resource(cls, resource_name, resource):
+        """
+        Adds a resource to the attribute and trigram indexes.
+
+        Args:
+            resource_name (str): The key of the resource in the collection.
+            resource: The resource.
+        """
+        for attribute in cls._indexed_attributes:
+            value = getattr(resource, attribute)
+            if value is None:
+                continue
+            cls._indexes.setdefault(attribute, {}).setdefault(value, set()).add(resource_name)
+
+        if cls._search_attributes:
+            trigrams = set()
+            for attribute in cls._search_attributes:
+                value = getattr(resource, attribute)
+                if value:
+                    trigrams.update(_get_trigrams(unicode(value).lower()))
+
+            cls._resource_trigrams[resource_name] = trigrams
+            for trigram in trigrams:
+                cls._trigram_index.setdefault(trigram, set()).add(resource_name)
+
+    @classmethod
+    def _unindex_resource(cls, resource_name, resource):
+        """
+        Removes a resource from the attribute indexes, using its current attribute values.
+
+        Args:
+            resource_name (str): The key of the resource in the collection.
+            resource: The resource.
+        """
+        for attribute in cls._indexed_attributes:
+            value = getattr(resource, attribute)
+            try:
+                names = cls._indexes[attribute][value]
+            except KeyError:
+                continue
+            names.discard(resource_name)
+            if not names:
+                del cls._indexes[attribute][value]
+
+        for trigram in cls._resource_trigrams.pop(resource_name, ()):
+            names = cls._trigram_index[trigram]
+            names.discard(resource_name)
+            if not names:
+                del cls._trigram_index[trigram]
+
+    @classmethod
+    def _remove_sorted_name(cls, resource_name):
+        index = bisect.bisect_left(cls._sorted_names, resource_name)
+        if index < len(cls._sorted_names) and cls._sorted_names[index] == resource_name:
+            del cls._sorted_names[index]
+
+    @classmethod
+    def _get_prefix_range(cls, prefix):
+        """
+        Locates the names of managed resources starting with ``prefix`` in ``_sorted_names``.
+
+        Returns:
+            The start and stop indexes of the matching names.
+        """
+        names = cls._sorted_names
+        start = bisect.bisect_left(names, prefix)
+
+        # Every name starting with the prefix sorts before the prefix with its last character incremented.
+        head = prefix.rstrip(unichr(sys.maxunicode))
+        if head:
+            stop = bisect.bisect_left(names, head[:-1] + unichr(ord(head[-1]) + 1))
+        else:
+            stop = len(names)
+
+        return start, stop
+
+    @classmethod
+    def _iter_sorted_resources(cls, start_after=None):
+        """
+        Yields the names of managed resources in sorted order, each with its resource.
+
+        The position is found again by bisection for every name, so resources created or deleted
+        during iteration do not disturb it. Each name is looked up under the same lock as its
+        position, so a resource is never yielded without the name it is managed under.
+
+        Args:
+            start_after (basestring): Only names sorting after this one are yielded.
+        """
+        names = cls._sorted_names
+        collection = cls._resource_collection
+        name = start_after
+        while True:
+            with _read_lock():
+                index = 0 if name is None else bisect.bisect_right(names, name)
+                if index >= len(names):
+                    return
+                name = names[index]
+                resource = collection[name]
+            yield name, resource
+
+    @classmethod
+    @_reads
+    def _get_resources_by(cls, attribute, value):
+        """
+        Computes a list of all managed resources with an attribute exactly matching a value.
+
+        Args:
+            attribute (str): One of the manager's ``_indexed_attributes``.
+            value (basestring): The value to match.
+
+        Returns:
+            List of resources, sorted by name.
+        """
+        if attribute not in cls._indexed_attributes:
+            msg = 'Search Failed: {0} attribute "{1}" is not indexed.'.format(cls._resource_type.__name__, attribute)
             _LOG.error(msg)
-            raise ResourceUpdateError(msg)
+            raise ValueError(msg)
 
-        if resource.name != resource_name:
-            del cls._resource_collection[resource_name]
-            cls._resource_collection[resource.name] = resource
+        if value is not None:
+            value = unicode(value).strip()
+
+        names = cls._indexes.get(attribute, {}).get(value, ())
+        result = [cls._resource_collection[name] for name in names]
+        result.sort(key=operator.attrgetter('name'))
 
-        _LOG.debug('Update Complete: {0} "{1}"'.format(resource_type_name, resource_name))
+        return result
 
     @classmethod
-    def _delete_resource(cls, resource_name):
-        resource_type_name = cls._resource_type.__name__
+    @instrumented('search', qualify=True, describe=describe_manager)
+    @_reads
+    def _search_text(cls, text, limit=None):
+        """
+        Computes a ranked list of managed resources containing ``text`` in one of their ``_search_attributes``.
 
-        try:
-            del cls._resource_collection[resource_name]
-        except KeyError:
-            msg = 'Delete Failed: {0} "{1}" not found.'.format(resource_type_name, resource_name)
-            _LOG.debug(msg)
+        Matching is case-insensitive. Candidates are drawn from the trigram index and then checked
+        for the full substring. Matches in earlier search attributes rank first, then matches closer
+        to the start of the value, then shorter values, then names.
+
+        Args:
+            text (basestring): The substring to search for.
+            limit (int): Maximum number of resources to return. All matches are returned if None.
+
+        Returns:
+            List of resources.
+        """
+        text = unicode(text).strip().lower()
+
+        _LOG.debug('Text Search Started: "%s"', text)
+
+        if len(text) < 3:
+            candidates = cls._resource_collection.keys()
         else:
-            msg = 'Delete Complete: {0} "{1}"'.format(resource_type_name, resource_name)
-            _LOG.debug(msg)
+            postings = []
+            for trigram in _get_trigrams(text):
+                try:
+                    postings.append(cls._trigram_index[trigram])
+                except KeyError:
+                    postings = []
+                    break
+            postings.sort(key=len)
+            candidates = set(postings[0]).intersection(*postings[1:]) if postings else ()
+
+        ranked = []
+        for name in candidates:
+            resource = cls._resource_collection[name]
+            for rank, attribute in enumerate(cls._search_attributes):
+                value = getattr(resource, attribute)
+                if not value:
+                    continue
+                value = unicode(value).lower()
+                position = value.find(text)
+                if position >= 0:
+                    ranked.append(((rank, position, len(value), name), resource))
+                    break
+
+        if limit is None:
+            ranked.sort(key=operator.itemgetter(0))
+        else:
+            ranked = heapq.nsmallest(limit, ranked, key=operator.itemgetter(0))
+        result = [resource for _, resource in ranked]
+
+        _LOG.debug('Text Search Complete: %3d matches', len(result))
+        return result
 
     @classmethod
+    @instrumented('find', qualify=True, describe=describe_manager)
+    @_reads
     def _find_resources(cls, attr_patterns):
-        # TODO: Memoize
-        _LOG.debug('Search Started')
+        """
+        Computes a list of all managed resources with attributes matching regex patterns.
 
-        result = []
+        A resource must match every pattern. Attributes with no pattern are skipped; if no patterns
+        remain, nothing matches.
+
+        Args:
+            attr_patterns ([(str, str)]): Attribute names and the regex patterns to match them with.
 
+        Returns:
+            List of resources, sorted by name.
+        """
+        predicates = []
         for attribute, pattern in attr_patterns:
-            op = operator.attrgetter(attribute)
+            if not pattern or not unicode(pattern).strip():
+                _LOG.debug('Skipping Attribute "%s": No Pattern "%s"', attribute, pattern)
+                continue
+            predicates.append(Matches(attribute, pattern))
+
+        if not predicates:
+            return []
+
+        return cls._query_resources(AllOf(*predicates))
+
+    @classmethod
+    @instrumented('query', qualify=True, describe=describe_manager)
+    @_reads
+    def _query_resources(cls, predicate):
+        """
+        Computes a list of all managed resources satisfying a query predicate.
+
+        Results are cached until the manager's generation changes, which happens on every create,
+        update and delete.
+
+        Args:
+            predicate (class::`Predicate`): The query.
+
+        Returns:
+            List of resources, sorted by name.
+        """
+        _LOG.debug('Search Started: %r', predicate)
+
+        cache_key = (cls, cls._generation, predicate)
+
+        result = _search_cache.get(cache_key)
+        record_cache('ResourceManager.query', result is not None)
+        if result is None:
+            result = cls._execute_query(predicate)
+            _search_cache.set(cache_key, result)
+
+        _LOG.debug('Search Complete: %3d matches', len(result))
+        return list(result)
 
-            if pattern:
-                _pattern = unicode(pattern).strip()
+    @classmethod
+    def _iter_resources(cls, predicate=None, limit=None, offset=0, start_after=None):
+        """
+        Yields managed resources satisfying a query predicate, sorted by name, one page at a time.
+
+        Without an index to plan from, names are walked in sorted order and filtered as they are
+        yielded. The walk sees changes made while it runs, so a resource renamed during the walk
+        may be skipped or yielded twice.
+
+        Otherwise the indexed candidates are filtered and only the first ``offset + limit`` are
+        ordered, using a heap. The page is gathered under a single read lock, so it is consistent
+        with a single state of the manager.
+
+        Args:
+            predicate (class::`Predicate`): The query. Every resource matches if None.
+            limit (int): Maximum number of resources to yield. All matches are yielded if None.
+            offset (int): Number of matching resources to skip.
+            start_after (basestring): A continuation token; only resources whose names sort after it
+                are yielded. Pass the name of the last resource of the previous page.
+        """
+        if limit is not None and limit <= 0:
+            return
+
+        collection = cls._resource_collection
+
+        with _read_lock():
+            if predicate is None:
+                names, exact = None, True
             else:
-                _LOG.debug('Skipping Attribute "{0}": No Pattern "{1}"'.format(attribute, pattern))
-                continue
+                _, names, exact = predicate.plan(cls)
 
-            if _pattern:
-                pattern = re.compile(_pattern)
+            if names is None:
+                ordered = cls._iter_sorted_resources(start_after)
             else:
-                _LOG.debug('Skipping Attribute "{0}": Empty Pattern'.format(attribute))
+                candidates = ((n, collection[n]) for n in names if start_after is None or n > start_after)
+                if not exact:
+                    candidates = ((n, r) for n, r in candidates if predicate.matches(r))
+                if limit is None:
+                    ordered = sorted(candidates, key=operator.itemgetter(0))
+                else:
+                    ordered = heapq.nsmallest(offset + limit, candidates, key=operator.itemgetter(0))
+                exact = True
+
+        skipped = 0
+        yielded = 0
+        for _, resource in ordered:
+            if not (exact or predicate.matches(resource)):
+                continue
+
+            if skipped < offset:
+                skipped += 1
                 continue
 
-            result.extend([r for r in cls._resource_collection.itervalues() if pattern.match(op(r))])
+            yield resource
+
+            yielded += 1
+            if yielded == limit:
+                return
+
+    @classmethod
+    def _execute_query(cls, predicate):
+        _, names, exact = predicate.plan(cls)
+
+        try:
+            if names is None:
+                result = [r for r in cls._resource_collection.itervalues() if predicate.matches(r)]
+            else:
+                result = [cls._resource_collection[name] for name in names]
+                if not exact:
+                    result = [r for r in result if predicate.matches(r)]
+        except AttributeError as e:
+            msg = 'Search Failed: {0} - {1}'.format(cls._resource_type.__name__, e)
+            _LOG.error(msg)
+            raise ResourceAttributeNotFoundError(msg)
 
         result.sort(key=operator.attrgetter('name'))
 
-        _LOG.debug('Search Complete: {0:3d} matches'.format(len(result)))
         return result
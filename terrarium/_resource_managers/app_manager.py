@@ -13,6 +13,13 @@ class AppManager(ResourceManager):
     """
     _resource_type = App
     _resource_collection = {}
+    _generation = 0
+    _indexed_attributes = ('location', 'executable')
+    _indexes = {}
+    _sorted_names = []
+    _search_attributes = ('name', 'description')
+    _trigram_index = {}
+    _resource_trigrams = {}
 
     @classmethod
     def create_app(cls, name, location, executable, description=None):
@@ -46,7 +53,8 @@ class AppManager(ResourceManager):
         return cls._get_resource(name)
 
     @classmethod
-    def update_app(cls, name, new_name=None, new_description=None, new_location=None, new_executable=None):
+    def update_app(cls, name, new_name=None, new_description=None, new_location=None, new_executable=None,
+                   cascade=False):
         """
         Update an existing class::`App`.
 
@@ -58,6 +66,8 @@ class AppManager(ResourceManager):
             new_description (basestring): New description for the App.
             new_location (basestring): New path to the directory containing the executable.
             new_executable (basestring): New filename of the executable.
+            cascade (bool): If True and the App is renamed, class::`RuntimeProfile` instances using it are updated
+                to the new name as part of the same update.
         """
         update_kwargs = {}
         if new_name is not None:
@@ -68,17 +78,18 @@ class AppManager(ResourceManager):
             update_kwargs['location'] = new_location
         if new_executable is not None:
             update_kwargs['executable'] = new_executable
-        super(AppManager, cls)._update_resource(name, **update_kwargs)
+        super(AppManager, cls)._update_resource(name, cascade=cascade, **update_kwargs)
 
     @classmethod
-    def delete_app(cls, name):
+    def delete_app(cls, name, cascade=False):
         """
         Remove all data describing an class::`App`
 
         Args:
             name (basestring): Name of an existing class::`App`.
+            cascade (bool): If True, class::`RuntimeProfile` instances using the App are deleted too.
         """
-        cls._delete_resource(name)
+        cls._delete_resource(name, cascade=cascade)
 
     @classmethod
     def find_apps(cls, name_pattern=None):
@@ -95,3 +106,80 @@ class AppManager(ResourceManager):
         result = cls._find_resources(attr_patterns)
 
         return result
+
+    @classmethod
+    def query_apps(cls, predicate):
+        """
+        Computes a list of all managed class::`App` instances satisfying a query.
+
+        Queries combine class::`Equals`, class::`In` and class::`Matches` predicates with class::`AllOf` and
+        class::`AnyOf`, or with the ``&`` and ``|`` operators.
+
+        Args:
+            predicate (class::`Predicate`): The query.
+
+        Returns:
+            List[class::`App`]
+        """
+        return cls._query_resources(predicate)
+
+    @classmethod
+    def iter_apps(cls, predicate=None, limit=None, offset=0, start_after=None):
+        """
+        Iterates over managed class::`App` instances in name order, optionally filtered and paged.
+
+        Only the requested page is ordered, so fetching a page costs time proportional to the page rather than the
+        number of managed class::`App` instances.
+
+        Args:
+            predicate (class::`Predicate`): The query. Every class::`App` matches if None.
+            limit (int): Maximum number of results. All matches are returned if None.
+            offset (int): Number of matches to skip.
+            start_after (basestring): Name of the last class::`App` of the previous page.
+
+        Returns:
+            Generator of class::`App` instances.
+        """
+        return cls._iter_resources(predicate, limit=limit, offset=offset, start_after=start_after)
+
+    @classmethod
+    def search_apps(cls, text, limit=None):
+        """
+        Computes a ranked list of managed class::`App` instances whose name or description contains ``text``.
+
+        Matching is case-insensitive. Name matches rank above description matches.
+
+        Args:
+            text (basestring): The substring to search for.
+            limit (int): Maximum number of results. All matches are returned if None.
+
+        Returns:
+            List[class::`App`]
+        """
+        return cls._search_text(text, limit=limit)
+
+    @classmethod
+    def find_apps_by_location(cls, location):
+        """
+        Computes a list of all managed class::`App` instances whose ``location`` exactly matches.
+
+        Args:
+            location (basestring): Path to the directory containing the executable.
+
+        Returns:
+            List[class::`App`]
+        """
+        return cls._get_resources_by('location', location)
+
+    @classmethod
+    def find_apps_by_executable(cls, executable):
+        """
+        Computes a list of all managed class::`App` instances whose ``executable`` exactly matches.
+
+        Args:
+            executable (basestring): Filename of the executable.
+
+        Returns:
+            List[class::`App`]
+        """
+        return cls._get_resources_by('executable', executable)
@@ -13,6 +13,13 @@ class EnvironmentManager(ResourceManager):
     """
     _resource_type = Environment
     _resource_collection = {}
+    _generation = 0
+    _indexed_attributes = ('parent',)
+    _indexes = {}
+    _sorted_names = []
+    _search_attributes = ('name', 'description')
+    _trigram_index = {}
+    _resource_trigrams = {}
 
     @classmethod
     def create_environment(cls, name, description=None, parent=None, variables=None):
@@ -47,7 +54,8 @@ class EnvironmentManager(ResourceManager):
         return cls._get_resource(name)
 
     @classmethod
-    def update_environment(cls, name, new_name=None, new_description=None, new_parent=None, update_variables=None):
+    def update_environment(cls, name, new_name=None, new_description=None, new_parent=None, update_variables=None,
+                           cascade=False):
         """
         Update an existing class::`Environment`.
 
@@ -59,6 +67,9 @@ class EnvironmentManager(ResourceManager):
             new_description (basestring): New description for the Environment.
             new_parent (basestring): Name of an existing Environment.
             update_variables (basestring): New key-value pairs representing environment variable names and values.
+            cascade (bool): If True and the Environment is renamed, child class::`Environment` and
+                class::`RuntimeProfile` instances referring to it are updated to the new name as part of the same
+                update.
         """
         update_kwargs = {}
         if new_name is not None:
@@ -69,17 +80,19 @@ class EnvironmentManager(ResourceManager):
             update_kwargs['parent'] = new_parent
         if update_variables is not None:
             update_kwargs['variables'] = update_variables
-        super(EnvironmentManager, cls)._update_resource(name, **update_kwargs)
+        super(EnvironmentManager, cls)._update_resource(name, cascade=cascade, **update_kwargs)
 
     @classmethod
-    def delete_environment(cls, name):
+    def delete_environment(cls, name, cascade=False):
         """
         Remove all data describing an class::`Environment`
 
         Args:
             name (basestring): Name of an existing class::`Environment`.
+            cascade (bool): If True, child class::`Environment` instances and class::`RuntimeProfile` instances
+                referring to the Environment, or to any deleted child, are deleted too.
         """
-        cls._delete_resource(name)
+        cls._delete_resource(name, cascade=cascade)
 
     @classmethod
     def find_environments(cls, name_pattern=None):
@@ -96,3 +109,75 @@ class EnvironmentManager(ResourceManager):
         result = cls._find_resources(attr_patterns)
 
         return result
+
+    @classmethod
+    def query_environments(cls, predicate):
+        """
+        Computes a list of all managed class::`Environment` instances satisfying a query.
+
+        Queries combine class::`Equals`, class::`In` and class::`Matches` predicates with class::`AllOf` and
+        class::`AnyOf`, or with the ``&`` and ``|`` operators.
+
+        Args:
+            predicate (class::`Predicate`): The query.
+
+        Returns:
+            List[class::`Environment`]
+        """
+        return cls._query_resources(predicate)
+
+    @classmethod
+    def iter_environments(cls, predicate=None, limit=None, offset=0, start_after=None):
+        """
+        Iterates over managed class::`Environment` instances in name order, optionally filtered and paged.
+
+        Only the requested page is ordered, so fetching a page costs time proportional to the page rather than the
+        number of managed class::`Environment` instances.
+
+        Args:
+            predicate (class::`Predicate`): The query. Every class::`Environment` matches if None.
+            limit (int): Maximum number of results. All matches are returned if None.
+            offset (int): Number of matches to skip.
+            start_after (basestring): Name of the last class::`Environment` of the previous page.
+
+        Returns:
+            Generator of class::`Environment` instances.
+        """
+        return cls._iter_resources(predicate, limit=limit, offset=offset, start_after=start_after)
+
+    @classmethod
+    def search_environments(cls, text, limit=None):
+        """
+        Computes a ranked list of managed class::`Environment` instances whose name or description contains ``text``.
+
+        Matching is case-insensitive. Name matches rank above description matches.
+
+        Args:
+            text (basestring): The substring to search for.
+            limit (int): Maximum number of results. All matches are returned if None.
+
+        Returns:
+            List[class::`Environment`]
+        """
+        return cls._search_text(text, limit=limit)
+
+    @classmethod
+    def find_environments_by_parent(cls, parent):
+        """
+        Computes a list of all managed class::`Environment` instances whose ``parent`` exactly matches.
+
+        Args:
+            parent (basestring): Name of the parent class::`Environment`.
+
+        Returns:
+            List[class::`Environment`]
+        """
+        return cls._get_resources_by('parent', parent)
+
+    @classmethod
+    def _names_changed(cls, names):
+        for name in names:
+            Environment._invalidate_dependents(name)
+
+
+EnvironmentManager._register_dependent(EnvironmentManager, 'parent')
@@ -2,6 +2,8 @@ import logging
 
 from .._resource_types import RuntimeProfile
 from ._resource_manager import ResourceManager
+from .app_manager import AppManager
+from .environment_manager import EnvironmentManager
 
 
 _LOG = logging.getLogger(__name__)
@@ -13,6 +15,13 @@ class RuntimeProfileManager(ResourceManager):
     """
     _resource_type = RuntimeProfile
     _resource_collection = {}
+    _generation = 0
+    _indexed_attributes = ('app', 'environment')
+    _indexes = {}
+    _sorted_names = []
+    _search_attributes = ('name', 'description')
+    _trigram_index = {}
+    _resource_trigrams = {}
 
     @classmethod
     def create_runtime_profile(cls, name, app, environment, cmd_args=None,
@@ -92,3 +101,84 @@ class RuntimeProfileManager(ResourceManager):
         result = cls._find_resources(attr_patterns)
 
         return result
+
+    @classmethod
+    def query_runtime_profiles(cls, predicate):
+        """
+        Computes a list of all managed class::`RuntimeProfile` instances satisfying a query.
+
+        Queries combine class::`Equals`, class::`In` and class::`Matches` predicates with class::`AllOf` and
+        class::`AnyOf`, or with the ``&`` and ``|`` operators.
+
+        Args:
+            predicate (class::`Predicate`): The query.
+
+        Returns:
+            List[class::`RuntimeProfile`]
+        """
+        return cls._query_resources(predicate)
+
+    @classmethod
+    def iter_runtime_profiles(cls, predicate=None, limit=None, offset=0, start_after=None):
+        """
+        Iterates over managed class::`RuntimeProfile` instances in name order, optionally filtered and paged.
+
+        Only the requested page is ordered, so fetching a page costs time proportional to the page rather than the
+        number of managed class::`RuntimeProfile` instances.
+
+        Args:
+            predicate (class::`Predicate`): The query. Every class::`RuntimeProfile` matches if None.
+            limit (int): Maximum number of results. All matches are returned if None.
+            offset (int): Number of matches to skip.
+            start_after (basestring): Name of the last class::`RuntimeProfile` of the previous page.
+
+        Returns:
+            Generator of class::`RuntimeProfile` instances.
+        """
+        return cls._iter_resources(predicate, limit=limit, offset=offset, start_after=start_after)
+
+    @classmethod
+    def search_runtime_profiles(cls, text, limit=None):
+        """
+        Computes a ranked list of managed class::`RuntimeProfile` instances whose name or description contains ``text``.
+
+        Matching is case-insensitive. Name matches rank above description matches.
+
+        Args:
+            text (basestring): The substring to search for.
+            limit (int): Maximum number of results. All matches are returned if None.
+
+        Returns:
+            List[class::`RuntimeProfile`]
+        """
+        return cls._search_text(text, limit=limit)
+
+    @classmethod
+    def find_runtime_profiles_by_app(cls, app):
+        """
+        Computes a list of all managed class::`RuntimeProfile` instances whose ``app`` exactly matches.
+
+        Args:
+            app (basestring): Name of an class::`App`.
+
+        Returns:
+            List[class::`RuntimeProfile`]
+        """
+        return cls._get_resources_by('app', app)
+
+    @classmethod
+    def find_runtime_profiles_by_environment(cls, environment):
+        """
+        Computes a list of all managed class::`RuntimeProfile` instances whose ``environment`` exactly matches.
+
+        Args:
+            environment (basestring): Name of an class::`Environment`.
+
+        Returns:
+            List[class::`RuntimeProfile`]
+        """
+        return cls._get_resources_by('environment', environment)
+
+
+AppManager._register_dependent(RuntimeProfileManager, 'app')
+EnvironmentManager._register_dependent(RuntimeProfileManager, 'environment')
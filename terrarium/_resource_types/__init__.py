@@ -1,3 +1,6 @@
 from .app import App
+from .compiled_value import CompiledValue, VariableReference
+from .mapping_proxy import MappingProxy
+from .sequence_proxy import SequenceProxy
 from .environment import Environment
 from .runtime_profile import RuntimeProfile
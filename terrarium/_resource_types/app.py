@@ -1,3 +1,6 @@
+from .._intern import intern_string
+
+
 class App(object):
     """
     Represents an executable application.
@@ -6,6 +9,8 @@ class App(object):
         - The 'location' is the path to the directory containing the executable
         - The 'executable' is he executable file name.
     """
+    __slots__ = ('_name', '_location', '_executable', '_description', '__weakref__')
+
     @property
     def name(self):
         """
@@ -47,7 +52,7 @@ class App(object):
         if value:
             value = unicode(value).strip()
             if value:
-                self._location = value
+                self._location = intern_string(value)
             else:
                 raise ValueError('App location cannot be empty.')
         else:
@@ -70,7 +75,7 @@ class App(object):
         if value:
             value = unicode(value).strip()
             if value:
-                self._executable = value
+                self._executable = intern_string(value)
             else:
                 raise ValueError('App executable cannot be empty.')
         else:
@@ -116,6 +121,18 @@ class App(object):
         self.executable = executable
         self.description = description
 
+    def __getstate__(self):
+        return {'_name': self._name,
+                '_location': self._location,
+                '_executable': self._executable,
+                '_description': self._description}
+
+    def __setstate__(self, state):
+        self._name = state['_name']
+        self._location = intern_string(state['_location'])
+        self._executable = intern_string(state['_executable'])
+        self._description = state.get('_description')
+
     def __eq__(self, other):
         try:
             return all([self.location == other.location,
@@ -0,0 +1,152 @@
+import collections
+import re
+
+from .._cache import LRUCache
+
+
+_TOKEN_PATTERN = re.compile(r'@\[(?P<internal>\w*)\]@|[%$]\{*(?P<external>\w*)[%}]?')
+_INTERNAL_VAR_FORMAT = u'@[{0}]@'.format
+
+_COMPILE_CACHE_SIZE = 4096
+_compile_cache = LRUCache(_COMPILE_CACHE_SIZE)
+
+
+class VariableReference(collections.namedtuple('VariableReference', ('name', 'text', 'internal'))):
+    """
+    A reference to an environment variable within a class::`CompiledValue`.
+
+    Attributes:
+        name (str): The name of the referenced variable.
+        text (str): The exact text of the reference as it appeared in the source value.
+        internal (bool): True if the reference was written in the internal ``@[name]@`` form.
+    """
+    __slots__ = ()
+
+
+class CompiledValue(object):
+    """
+    A string value split into literal text and variable references.
+
+    Values are tokenized once, in a single pass, recognizing the ``%name%``, ``$name`` and ``${name}`` forms as well
+    as the internal ``@[name]@`` form used by class::`Environment` to store references. Rendering a CompiledValue is a
+    single join over its segments, so values that are expanded repeatedly only pay the tokenizing cost once.
+
+    CompiledValues are immutable; use ``CompiledValue.compile`` to share instances for identical strings.
+    """
+    __slots__ = ('_value', '_segments', '_references')
+
+    @property
+    def value(self):
+        """
+        The source string the CompiledValue was built from.
+        """
+        return self._value
+
+    @property
+    def segments(self):
+        """
+        The literal strings and class::`VariableReference` instances making up the value, in order.
+
+        Returns:
+            A tuple of strings and class::`VariableReference` instances.
+        """
+        return self._segments
+
+    @property
+    def references(self):
+        """
+        The names of all variables referenced by the value.
+
+        Returns:
+            A tuple of variable names in order of first appearance.
+        """
+        return self._references
+
+    @classmethod
+    def compile(cls, value):
+        """
+        Retrieves a shared CompiledValue for ``value``.
+
+        Args:
+            value (str): The string to compile.
+
+        Returns:
+            A class::`CompiledValue` instance.
+        """
+        result = _compile_cache.get(value)
+        if result is None:
+            result = cls(value)
+            _compile_cache.set(value, result)
+        return result
+
+    def __init__(self, value):
+        """
+        Tokenizes a string into a CompiledValue.
+
+        Args:
+            value (str): The string to compile.
+        """
+        super(CompiledValue, self).__init__()
+
+        segments = []
+        references = []
+        position = 0
+
+        for match in _TOKEN_PATTERN.finditer(value):
+            internal_name, external_name = match.group('internal', 'external')
+            name = internal_name or external_name
+            if not name:
+                continue
+
+            start, end = match.span()
+            if start > position:
+                segments.append(value[position:start])
+            segments.append(VariableReference(name, match.group(0), internal_name is not None))
+            if name not in references:
+                references.append(name)
+            position = end
+
+        if position < len(value):
+            segments.append(value[position:])
+
+        self._value = value
+        self._segments = tuple(segments)
+        self._references = tuple(references)
+
+    def render(self, resolve_reference):
+        """
+        Joins the segments of the value, substituting each variable reference.
+
+        Args:
+            resolve_reference (callable): Called with each class::`VariableReference`; must return the string to
+                substitute for it.
+
+        Returns:
+            The rendered string.
+        """
+        return u''.join([s if s.__class__ is not VariableReference else resolve_reference(s)
+                         for s in self._segments])
+
+    def internal_form(self):
+        """
+        Renders the value with every variable reference in the internal ``@[name]@`` form.
+
+        Returns:
+            The value as a string suitable for storage in an class::`Environment`.
+        """
+        return self.render(lambda reference: _INTERNAL_VAR_FORMAT(reference.name))
+
+    def __eq__(self, other):
+        try:
+            return self.value == other.value
+        except AttributeError:
+            return False
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self._value)
+
+    def __repr__(self):
+        return '{0}({1!r})'.format(self.__class__.__name__, self._value)
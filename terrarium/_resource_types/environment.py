@@ -1,16 +1,310 @@
+import itertools
 import os
 import re
 import logging
+import weakref
+
+from .._cache import LRUCache
+from .._errors import VariableCycleError
+from .._instrumentation import describe_resource, instrumented
+from .._intern import intern_string
+from .._metrics import record_cache
+from .._runtime_environment import get_runtime_environment
+from .compiled_value import CompiledValue
+from .mapping_proxy import MappingProxy
 
 
 _LOG = logging.getLogger(__name__)
 
-_VAR_PATTERN = re.compile(r'([%$]\{*(?P<var>\w*)[%}]?)')
 _VAR_FORMATS = ('%{0}%'.format,
                 '${0}'.format,
                 '${{{0}}}'.format)
-_INTERNAL_VAR_PATTERN = re.compile(r'(@\[(?P<var>\w*)\]@)')
-_INTERNAL_VAR_FORMAT = '@[{0}]@'.format
+
+_EXPANSION_CACHE_SIZE = 1024
+_RESOLUTION_CACHE_SIZE = 16
+_MISSING = object()
+_RESOLVE_ALL = object()
+_COMPRESSION_INDEX = object()
+_STATE_SERIALS = itertools.count(1)
+
+_chain_dependents = {}
+
+def _get_var_format(var_format):
+    if not var_format:
+        return '%{0}%'.format
+    elif isinstance(var_format, basestring):
+        return str(var_format).format
+    return var_format
+
+
+_environment_manager = None
+
+
+def _get_environment_manager():
+    global _environment_manager
+    if _environment_manager is None:
+        from .._resource_managers import EnvironmentManager
+        _environment_manager = EnvironmentManager
+    return _environment_manager
+
+
+def _get_overrides_key(overrides):
+    if overrides:
+        return frozenset(overrides.iteritems())
+    return None
+
+
+def _get_runtime_environment(use_runtime_environment):
+    if use_runtime_environment:
+        return get_runtime_environment()
+    return None
+
+
+def _get_runtime_environment_key(runtime_environment):
+    if runtime_environment is None:
+        return None
+    return runtime_environment.version
+
+
+def _finalize(value, runtime_environment):
+    if runtime_environment is not None:
+        value = runtime_environment.expandvars(value)
+
+    return os.path.normpath(value)
+
+
+class _Resolution(object):
+    """
+    Resolves the variables of an Environment for a single var_format and set of overrides.
+
+    Variable references form a dependency graph. Resolution walks that graph depth-first, so every variable is
+    rendered only after the variables it references, and each variable is rendered at most once. Resolved values are
+    retained, so later requests only pay for variables that have not been resolved yet.
+    """
+    __slots__ = ('_environment', '_variables', '_var_format', '_overrides', 'resolved')
+
+    def __init__(self, environment, var_format, overrides):
+        super(_Resolution, self).__init__()
+
+        self._environment = environment
+        self._variables = environment._get_flattened_vars()
+        self._var_format = var_format
+        self._overrides = overrides
+        self.resolved = {}
+
+    def _get_compiled(self, name):
+        try:
+            return CompiledValue.compile(self._overrides[name])
+        except KeyError:
+            return self._variables.get(name)
+
+    def _resolve_reference(self, reference):
+        try:
+            return self.resolved[reference.name]
+        except KeyError:
+            pass
+
+        if reference.internal:
+            return self._var_format(reference.name)
+        return reference.text
+
+    def resolve(self, names):
+        """
+        Resolves the named variables and everything they depend on.
+
+        Args:
+            names (iterable): Names of variables to resolve. Names that are not defined are ignored.
+
+        Raises:
+            VariableCycleError: If a variable depends on itself.
+        """
+        resolved = self.resolved
+
+        for root in names:
+            if root in resolved:
+                continue
+            compiled = self._get_compiled(root)
+            if compiled is None:
+                continue
+
+            path = [root]
+            stack = [(compiled, iter(compiled.references))]
+            while stack:
+                compiled, references = stack[-1]
+                for name in references:
+                    if name in resolved:
+                        continue
+                    if name in path:
+                        cycle = path[path.index(name):] + [name]
+                        msg = 'Failed to resolve Environment "{0}": Variable cycle {1}'
+                        msg = msg.format(self._environment.name, ' -> '.join(cycle))
+                        _LOG.error(msg)
+                        raise VariableCycleError(msg, cycle)
+                    dependency = self._get_compiled(name)
+                    if dependency is None:
+                        continue
+                    path.append(name)
+                    stack.append((dependency, iter(dependency.references)))
+                    break
+                else:
+                    stack.pop()
+                    resolved[path.pop()] = compiled.render(self._resolve_reference)
+
+    def render(self, compiled):
+        """
+        Renders a class::`CompiledValue` using resolved variable values.
+
+        Args:
+            compiled (CompiledValue): The value to render.
+
+        Returns:
+            The rendered string.
+        """
+        self.resolve(compiled.references)
+        return compiled.render(self._resolve_reference)
+
+
+class _CompressionIndex(object):
+    """
+    Replaces occurrences of known values with variable references in a single left-to-right pass.
+
+    The values are arranged in a character trie, which is emitted as a regular expression. At every node the
+    expression prefers to continue down the trie before accepting a shorter value, so each match is the longest
+    value starting at the leftmost possible position and matching never backtracks into earlier text.
+
+    The trie is walked without recursion, so values of any length can be indexed. The regular expression engine
+    parses nested groups recursively, though; if the values nest as prefixes of one another too deeply for it, the
+    index walks the trie directly instead.
+    """
+    def __init__(self, variables, var_format):
+        """
+        Builds the index.
+
+        Args:
+            variables ([(str, str)]): Variable names and expanded values in priority order. When several variables
+                share a value, the first one is used. Empty values are ignored.
+            var_format (callable): Produces the replacement text for a variable name.
+        """
+        super(_CompressionIndex, self).__init__()
+
+        replacements = {}
+        for name, value in variables:
+            if value and value not in replacements:
+                replacements[value] = var_format(name)
+
+        self._replacements = replacements
+        self._pattern = None
+        self._trie = None
+        if replacements:
+            trie = self._build_trie(replacements)
+            try:
+                self._pattern = re.compile(self._build_expression(trie), re.UNICODE)
+            except RuntimeError:
+                _LOG.debug('Compression index too deeply nested for a regular expression; walking the trie')
+                self._trie = trie
+
+    @staticmethod
+    def _build_trie(values):
+        trie = {}
+        for value in values:
+            node = trie
+            for character in value:
+                node = node.setdefault(character, {})
+            node[None] = None
+        return trie
+
+    @classmethod
+    def _build_expression(cls, trie):
+        # The trie is as deep as the longest value, so it is walked with an explicit stack rather than recursion.
+        # Each node's expression is built after its children's; runs of nodes with a single child and no value
+        # ending at them are emitted as one literal.
+        expressions = {}
+        stack = [(trie, False)]
+        while stack:
+            node, visited = stack.pop()
+            if not visited:
+                stack.append((node, True))
+                for character, child in node.iteritems():
+                    if character is not None:
+                        stack.append((cls._skip_run(child)[0], False))
+                continue
+
+            branches = []
+            for character, child in sorted(node.iteritems()):
+                if character is not None:
+                    child, run = cls._skip_run(child)
+                    branches.append(re.escape(character + run) + expressions.pop(id(child)))
+
+            if not branches:
+                result = ''
+            elif len(branches) == 1:
+                result = branches[0]
+            else:
+                result = '(?:{0})'.format('|'.join(branches))
+
+            if branches and None in node:
+                result = '(?:{0})?'.format(result)
+            expressions[id(node)] = result
+
+        return expressions[id(trie)]
+
+    @staticmethod
+    def _skip_run(node):
+        """
+        Follows a trie node down through descendants that have a single child and end no value.
+
+        Returns:
+            The first node that branches or ends a value, and the characters passed on the way.
+        """
+        run = []
+        while len(node) == 1 and None not in node:
+            character, node = next(node.iteritems())
+            run.append(character)
+        return node, u''.join(run)
+
+    def _replace(self, match):
+        return self._replacements[match.group(0)]
+
+    def compress(self, value):
+        """
+        Replaces the longest, leftmost occurrences of indexed values with their variable references.
+
+        Args:
+            value (str): The string to compress.
+
+        Returns:
+            The compressed string.
+        """
+        if self._pattern is not None:
+            return self._pattern.sub(self._replace, value)
+        if self._trie is None:
+            return value
+
+        result = []
+        copied = 0
+        position = 0
+        length = len(value)
+        while position < length:
+            node = self._trie
+            end = None
+            index = position
+            while index < length:
+                node = node.get(value[index])
+                if node is None:
+                    break
+                index += 1
+                if None in node:
+                    end = index
+
+            if end is None:
+                position += 1
+            else:
+                result.append(value[copied:position])
+                result.append(self._replacements[value[position:end]])
+                copied = position = end
+
+        result.append(value[copied:])
+        return u''.join(result)
 
 
 class Environment(object):
@@ -21,6 +315,9 @@ class Environment(object):
     They have the ability to expand and compress values based on the variable data
     available to themselves and hierarchical their ancestors.
     """
+    __slots__ = ('_name', '_parent', '_description', '_vars', '_flat_vars', '_flat_serial', '_expansion_cache',
+                 '_resolution_cache', '__weakref__')
+
     @property
     def name(self):
         """
@@ -53,6 +350,9 @@ class Environment(object):
         If the variable is not found, it will look up to its parent. This will repeat
         until the variable is resolved or an Environment is reached that has no parent.
 
+        Parents are looked up by name through the class::`EnvironmentManager`. A parent
+        that is not managed ends the chain.
+
         Returns:
             The name of the parent Environment or None.
         """
@@ -67,6 +367,7 @@ class Environment(object):
             self._parent = value
         else:
             raise ValueError('Environment parent must be a non-empty string.')
+        self._invalidate()
 
     @property
     def description(self):
@@ -107,6 +408,18 @@ class Environment(object):
     def variables(self, value):
         self.update(value)
 
+    @property
+    def variables_view(self):
+        """
+        A read-only view of the variables defined by the environment.
+
+        Unlike ``variables``, the view does not copy the variable data and reflects later changes to it.
+
+        Returns:
+            A class::`MappingProxy` with variable name keys and variable value values.
+        """
+        return MappingProxy(self._vars)
+
     def __init__(self, name, parent=None, variables=None, description=None):
         """
         Instantiates a new Environment instance.
@@ -125,6 +438,10 @@ class Environment(object):
         self._parent = None
         self._description = None
         self._vars = {}
+        self._flat_vars = None
+        self._flat_serial = None
+        self._expansion_cache = None
+        self._resolution_cache = None
 
         self.name = name
         self.parent = parent
@@ -132,6 +449,7 @@ class Environment(object):
         if variables:
             self.variables = variables
 
+    @instrumented('Environment.expand', describe=describe_resource)
     def expand(self, value, var_format=None, use_runtime_environment=True,
                overrides=None):
         """
@@ -144,7 +462,8 @@ class Environment(object):
             * %name%
 
         Args:
-            value (str): A string containing environment variables.
+            value (str or CompiledValue): A string containing environment variables.
+                A class::`CompiledValue` is rendered as-is, without normalizing the path first.
             var_format (str): String format expression used to generate a
                 variables final output form.
                 Example: '%{0}%'
@@ -160,59 +479,183 @@ class Environment(object):
         Return:
             The argument with environment variables expanded.
         """
-        value = os.path.normpath(value)
+        self._get_flattened_vars()
 
-        result = str(value)
-
-        if not overrides:
-            overrides = {}
-
-        if not var_format:
-            var_format = '%{0}%'.format
-        elif isinstance(var_format, basestring):
-            var_format = str(var_format).format
-
-        expanding = True
-        while expanding:
-            expanding = False
-            for match in _VAR_PATTERN.finditer(result):
-                var, var_name = match.groups()
-                try:
-                    value = overrides[var_name]
-                except KeyError:
-                    try:
-                        value = self._vars[var_name]
-                    except KeyError:
-                        continue
-                result = result.replace(var, value)
-                expanding = True
-            for match in _INTERNAL_VAR_PATTERN.findall(result):
-                var, var_name = match
-                result = result.replace(var, self._vars[var_name])
-                expanding = True
-
-        expanding = True
-        while expanding:
-            expanding = False
-            for match in _INTERNAL_VAR_PATTERN.finditer(result):
-                var, var_name = match.groups()
-                result = result.replace(var, var_format(var_name))
-                expanding = True
-
-        while use_runtime_environment:
-            r = os.path.expandvars(result)
-            use_runtime_environment = r != result
-            result = r
-
-        return os.path.normpath(result)
+        source = value.value if isinstance(value, CompiledValue) else value
+
+        runtime_environment = _get_runtime_environment(use_runtime_environment)
+
+        cache_key = (source, var_format, _get_runtime_environment_key(runtime_environment),
+                     _get_overrides_key(overrides))
+        cache = self._get_expansion_cache()
+        result = cache.get(cache_key, _MISSING)
+        record_cache('Environment.expand', result is not _MISSING)
+        if result is _MISSING:
+            result = self._expand(value, var_format, runtime_environment, overrides)
+            cache.set(cache_key, result)
+        return result
+
+    @instrumented('Environment.expand_many', describe=describe_resource)
+    def expand_many(self, values, var_format=None, use_runtime_environment=True, overrides=None):
+        """
+        Expands a sequence of strings.
+
+        Equivalent to calling ``expand`` for each value, but the variable resolution, runtime environment and
+        arguments are prepared once for the whole batch. Results are not added to the expansion cache, so large
+        batches do not evict frequently expanded values.
+
+        Args:
+            values (iterable): Strings or class::`CompiledValue` instances containing environment variables.
+            var_format (str): String format expression used to generate a
+                variables final output form.
+                Example: '%{0}%'
+            use_runtime_environment (bool): If true, once the Environment
+                instance has resolved all the variables it can, the runtime
+                environment is invoked to resolve any remaining variables.
+            overrides ({str:str}): Mapping of environment variable names and
+                values. If a variable name key matches an environment variable
+                defined in the Environment instance, the value from the
+                override map is used. If an override has no match in the
+                Environment instance, it will not be used at all.
+
+        Returns:
+            A list of expanded strings, in the order of ``values``.
+        """
+        self._get_flattened_vars()
+
+        runtime_environment = _get_runtime_environment(use_runtime_environment)
+        resolution = self._get_resolution(var_format, overrides)
+
+        result = []
+        for value in values:
+            if not isinstance(value, CompiledValue):
+                value = CompiledValue(os.path.normpath(value))
+            result.append(_finalize(resolution.render(value), runtime_environment))
+
+        return result
+
+    def expansion_cache_info(self):
+        """
+        Reports the effectiveness of the expansion cache.
 
+        Cached expansions are discarded whenever the variable data or parent of the Environment, or of any of its
+        ancestors, changes.
+
+        Returns:
+            A namedtuple of hits, misses, maxsize and currsize.
+        """
+        return self._get_expansion_cache().info()
+
+    def get_compiled(self, name):
+        """
+        Retrieves the compiled form of a variable defined by the Environment or its ancestors.
+
+        The compiled form is shared by every variable with the same value and can be passed to ``expand`` to avoid
+        tokenizing the value again.
+
+        Args:
+            name (str): The name of a variable.
+
+        Returns:
+            A class::`CompiledValue` instance.
+
+        Raises:
+            KeyError: If no variable exists with the given name.
+        """
+        result = self._get_flattened_vars().get(unicode(name).strip())
+        if result is None:
+            raise KeyError('Variable "{0}" not found.'.format(name))
+        return result
+
+    def resolve_all(self, var_format=None, use_runtime_environment=True, overrides=None):
+        """
+        Expands every variable defined by the Environment and its ancestors.
+
+        The variables are resolved in dependency order, so each variable is expanded exactly once no matter how
+        many other variables reference it.
+
+        Args:
+            var_format (str): String format expression used to generate a
+                variables final output form.
+                Example: '%{0}%'
+            use_runtime_environment (bool): If true, once the Environment
+                instance has resolved all the variables it can, the runtime
+                environment is invoked to resolve any remaining variables.
+            overrides ({str:str}): Mapping of environment variable names and
+                values. If a variable name key matches an environment variable
+                defined in the Environment instance, the value from the
+                override map is used. If an override has no match in the
+                Environment instance, it will not be used at all.
+
+        Returns:
+            A dictionary with variable name keys and expanded variable value values.
+
+        Raises:
+            VariableCycleError: If a variable references itself, directly or through other variables.
+        """
+        runtime_environment = _get_runtime_environment(use_runtime_environment)
+        return dict(self._resolve_all(var_format, runtime_environment, overrides))
+
+    def _resolve_all(self, var_format=None, runtime_environment=None, overrides=None):
+        """
+        Performs class::`Environment.resolve_all`, returning the cached result without copying it.
+
+        Args:
+            runtime_environment (RuntimeEnvironment): Snapshot used to resolve remaining variables, or None.
+        """
+        variables = self._get_flattened_vars()
+
+        cache_key = (_RESOLVE_ALL, var_format, _get_runtime_environment_key(runtime_environment),
+                     _get_overrides_key(overrides))
+        cache = self._get_expansion_cache()
+        result = cache.get(cache_key, _MISSING)
+        if result is _MISSING:
+            resolution = self._get_resolution(var_format, overrides)
+            resolution.resolve(variables)
+
+            result = {}
+            for name in variables:
+                result[name] = _finalize(resolution.resolved[name], runtime_environment)
+            cache.set(cache_key, result)
+        return result
+
+    def _get_resolution(self, var_format, overrides):
+        """
+        Retrieves the shared class::`_Resolution` for a var_format and set of overrides.
+        """
+        cache = self._resolution_cache
+        if cache is None:
+            cache = self._resolution_cache = LRUCache(_RESOLUTION_CACHE_SIZE)
+        cache_key = (var_format, _get_overrides_key(overrides))
+        result = cache.get(cache_key)
+        if result is None:
+            result = _Resolution(self, _get_var_format(var_format), dict(overrides or {}))
+            cache.set(cache_key, result)
+        return result
+
+    def _expand(self, value, var_format=None, runtime_environment=None, overrides=None):
+        """
+        Performs the uncached expansion for class::`Environment.expand`.
+
+        Args:
+            runtime_environment (RuntimeEnvironment): Snapshot used to resolve remaining variables, or None.
+        """
+        if not isinstance(value, CompiledValue):
+            value = CompiledValue.compile(os.path.normpath(value))
+
+        result = self._get_resolution(var_format, overrides).render(value)
+
+        return _finalize(result, runtime_environment)
+
+    @instrumented('Environment.compress', describe=describe_resource)
     def compress(self, value, var_format=None, use_runtime_environment=True,
                  overrides=None):
         """
         Replaces environment variable values with environment variable names.
 
         Compression works by inserting variables for the largest,
-        non-overlapping value matches.
+        non-overlapping value matches. The string is scanned once, left to
+        right, taking the longest variable value found at each position.
 
         Args:
             value (str): Object to condense
@@ -233,46 +676,70 @@ class Environment(object):
         """
         value = os.path.normpath(value)
 
-        result = str(value)
+        runtime_environment = _get_runtime_environment(use_runtime_environment)
+        index = self._get_compression_index(var_format, runtime_environment, overrides)
+
+        return os.path.normpath(index.compress(value))
+
+    @instrumented('Environment.compress_many', describe=describe_resource)
+    def compress_many(self, values, var_format=None, use_runtime_environment=True, overrides=None):
+        """
+        Compresses a sequence of strings.
+
+        Equivalent to calling ``compress`` for each value, but the compression index is retrieved once for the
+        whole batch.
 
-        if not var_format:
-            var_format = '%{0}%'.format
-        elif isinstance(var_format, basestring):
-            var_format = str(var_format).format
+        Args:
+            values (iterable): Strings to condense.
+            var_format (str): String format expression used to generate a
+                variables final output form.
+                Example: '%{0}%'
+            use_runtime_environment (bool): If true, once the Environment
+                instance has resolved all the variables it can, the runtime
+                environment is invoked to resolve any remaining variables.
+            overrides ({str:str}): Mapping of environment variable names and
+                values. If a variable name key matches an environment variable
+                defined in the Environment instance, the value from the
+                override map is used. If an override has no match in the
+                Environment instance, it will not be used at all.
 
-        if not overrides:
-            overrides = {}
+        Returns:
+            A list of compressed strings, in the order of ``values``.
+        """
+        runtime_environment = _get_runtime_environment(use_runtime_environment)
+        compress = self._get_compression_index(var_format, runtime_environment, overrides).compress
+        normpath = os.path.normpath
 
-        expanded_vars = {}
+        return [normpath(compress(normpath(value))) for value in values]
 
-        for name, value in self._vars.iteritems():
-            expanded_vars[name] = self.expand(
-                value, overrides=overrides,
-                use_runtime_environment=use_runtime_environment)
+    def _get_compression_index(self, var_format=None, runtime_environment=None, overrides=None):
+        """
+        Retrieves the class::`_CompressionIndex` for the current variable data.
 
-        if use_runtime_environment:
-            for name, value in os.environ.iteritems():
-                expanded_vars[name] = self.expand(value, overrides=overrides,
-                                                  use_runtime_environment=True)
+        The index is cached alongside expansions, so it is rebuilt only when the variable data of the Environment or
+        its ancestors, the runtime environment snapshot, or the arguments change.
 
-        sorted_var_names = sorted(
-            expanded_vars, reverse=True,
-            key=lambda vn: len(expanded_vars[vn]))
+        Args:
+            runtime_environment (RuntimeEnvironment): Snapshot whose variables are also compressed, or None.
+        """
+        self._get_flattened_vars()
 
-        while not expanded_vars[sorted_var_names[-1]]:
-            del expanded_vars[sorted_var_names.pop()]
+        cache_key = (_COMPRESSION_INDEX, var_format, _get_runtime_environment_key(runtime_environment),
+                     _get_overrides_key(overrides))
+        cache = self._get_expansion_cache()
+        result = cache.get(cache_key)
+        if result is None:
+            expanded_vars = self._resolve_all(var_format, runtime_environment, overrides)
+            variables = sorted(expanded_vars.iteritems())
 
-        compressing = True
-        while compressing:
-            compressing = False
-            for var_name in sorted_var_names:
-                if expanded_vars[var_name] in result:
-                    result = result.replace(expanded_vars[var_name],
-                                            var_format(var_name))
-                    compressing = True
-                    break
+            if runtime_environment is not None:
+                for name, value in sorted(runtime_environment.iteritems()):
+                    if name not in expanded_vars:
+                        variables.append((name, os.path.normpath(value)))
 
-        return os.path.normpath(result)
+            result = _CompressionIndex(variables, _get_var_format(var_format))
+            cache.set(cache_key, result)
+        return result
 
     def _set_var(self, name, value):
         """
@@ -295,23 +762,20 @@ class Environment(object):
                 msg = "Error setting {0}: Value cannot be empty.".format(name)
                 raise ValueError(msg)
 
-        while True:
-            match = _VAR_PATTERN.search(value)
-            if not match:
-                break
-            value = value.replace(match.group(0), _INTERNAL_VAR_FORMAT(match.group('var')))
+        name = intern_string(name)
+        value = intern_string(os.path.normpath(CompiledValue(value).internal_form()))
 
-        if name in self._vars:
-            msg = 'Updated Environment "{0}": MOD variable "{1}"'.format(self.name, name)
-        else:
-            msg = 'Updated Environment "{0}": ADD variable "{1}"'.format(self.name, name)
-        self._vars[name] = os.path.normpath(value)
-        _LOG.debug(msg)
+        action = 'MOD' if name in self._vars else 'ADD'
+        self._vars[name] = value
+        self._invalidate()
+        _LOG.debug('Updated Environment "%s": %s variable "%s"', self.name, action, name)
 
     def _get_var(self, name):
         """
         Resolves the given name with an assigned value.
 
+        The Environment's own variables take precedence over those of its ancestors.
+
         Args:
             name (str): The name of the Environment Setting
 
@@ -321,20 +785,141 @@ class Environment(object):
         name = unicode(name).strip()
 
         try:
-            return self._vars[name]
+            return self._get_flattened_vars()[name].value
         except KeyError:
             return None
 
+    def _get_expansion_cache(self):
+        """
+        Retrieves the cache of expansions and compression indexes, creating it on first use.
+
+        Environments that are never expanded, such as ancestors only read through their descendants, never pay for
+        one.
+
+        Returns:
+            A class::`LRUCache`.
+        """
+        result = self._expansion_cache
+        if result is None:
+            result = self._expansion_cache = LRUCache(_EXPANSION_CACHE_SIZE)
+        return result
+
+    def _get_environment_chain(self):
+        """
+        Computes the Environment followed by each of its ancestors, nearest first.
+
+        The Environment is registered as a dependent of every parent name looked up, including a final name that is
+        not managed, so changes to those Environments, or to which Environment is managed under those names, discard
+        its merged variables.
+
+        Returns:
+            A list of class::`Environment` instances.
+        """
+        manager = _get_environment_manager()
+
+        result = [self]
+        parent_name = self._parent
+        while parent_name is not None:
+            dependents = _chain_dependents.get(parent_name)
+            if dependents is None:
+                dependents = _chain_dependents.setdefault(parent_name, weakref.WeakSet())
+            dependents.add(self)
+
+            parent = manager._lookup_resource(parent_name)
+            if parent is None or any(parent is e for e in result):
+                break
+            result.append(parent)
+            parent_name = parent._parent
+
+        return result
+
+    def _get_flattened_vars(self):
+        """
+        Retrieves the compiled variables visible to the Environment, merged across its ancestors.
+
+        The merged table is built lazily and kept until it is discarded, either by a change to the Environment or by
+        a change pushed down from one of its ancestors, so retrieving it does not walk the parent chain.
+
+        Returns:
+            A dictionary with variable name keys and class::`CompiledValue` values.
+        """
+        result = self._flat_vars
+        if result is not None:
+            return result
+
+        serial = self._flat_serial = next(_STATE_SERIALS)
+        environments = self._get_environment_chain()
+
+        result = {}
+        for environment in reversed(environments):
+            for name, value in environment._vars.iteritems():
+                result[name] = CompiledValue.compile(value)
+
+        # An ancestor that changed while the table was built has already discarded it; keep the stale table out.
+        if self._flat_serial == serial:
+            self._flat_vars = result
+
+        return result
+
+    def _get_state(self):
+        """
+        Identifies the variable data visible to the Environment.
+
+        Returns:
+            An integer, unique across all Environments, that changes whenever the merged variable data changes.
+        """
+        self._get_flattened_vars()
+        serial = self._flat_serial
+        if serial is None:
+            serial = next(_STATE_SERIALS)
+        return serial
+
+    def _discard_flattened(self):
+        """
+        Discards the merged variables and everything derived from them.
+        """
+        self._flat_vars = None
+        self._flat_serial = None
+        if self._expansion_cache is not None:
+            self._expansion_cache.clear()
+        if self._resolution_cache is not None:
+            self._resolution_cache.clear()
+
+    def _invalidate(self):
+        """
+        Discards any data derived from the variables or parent of the Environment.
+
+        If the Environment is managed, the change is pushed down to every Environment whose parent chain passes
+        through it.
+        """
+        self._discard_flattened()
+        if self._name is not None and _get_environment_manager()._lookup_resource(self._name) is self:
+            Environment._invalidate_dependents(self._name)
+
+    @staticmethod
+    def _invalidate_dependents(name):
+        """
+        Discards the merged variables of every Environment whose parent chain looked up ``name``.
+
+        Called when the Environment managed under ``name`` changes, or a different Environment becomes managed under
+        it.
+
+        Args:
+            name (str): The name of an Environment, managed or not.
+        """
+        dependents = _chain_dependents.pop(name, None)
+        if dependents:
+            for environment in list(dependents):
+                environment._discard_flattened()
+
     def iterkeys(self):
-        return self._vars.iterkeys()
+        return self._get_flattened_vars().iterkeys()
 
     def itervalues(self):
-        for name in self._vars:
-            yield self.expand(self._get_var(name))
+        return self._resolve_all(runtime_environment=get_runtime_environment()).itervalues()
 
     def iteritems(self):
-        for name, value in self._vars.iteritems():
-            yield (name, self.expand(self._get_var(name)))
+        return self._resolve_all(runtime_environment=get_runtime_environment()).iteritems()
 
     def update(self, other, **kwargs):
         try:
@@ -350,7 +935,7 @@ class Environment(object):
         return True
 
     def __len__(self):
-        return len(self._vars)
+        return len(self._get_flattened_vars())
 
     def __getitem__(self, name):
         value = self._get_var(name)
@@ -362,21 +947,39 @@ class Environment(object):
         self._set_var(name, value)
 
     def __delitem__(self, name):
-        msg = 'Updated Environment "{0}": DEL variable "{1}"'.format(self.name, name)
         del self._vars[name]
-        _LOG.debug(msg)
+        self._invalidate()
+        _LOG.debug('Updated Environment "%s": DEL variable "%s"', self.name, name)
 
     def __iter__(self):
-        return self._vars.iterkeys()
+        return self._get_flattened_vars().iterkeys()
 
     def __contains__(self, name):
         return self._get_var(name) is not None
 
+    def __getstate__(self):
+        # Only the defining data is pickled. Compiled values, merged variables and caches are rebuilt on demand.
+        return {'_name': self._name,
+                '_parent': self._parent,
+                '_description': self._description,
+                '_vars': self._vars.copy()}
+
+    def __setstate__(self, state):
+        self._name = state['_name']
+        self._parent = state.get('_parent')
+        self._description = state.get('_description')
+        self._vars = dict((intern_string(name), intern_string(value))
+                          for name, value in state.get('_vars', {}).iteritems())
+        self._flat_vars = None
+        self._flat_serial = None
+        self._expansion_cache = None
+        self._resolution_cache = None
+
     def __eq__(self, other):
         try:
             return all([self.name == other.name,
                         self.parent == other.parent,
-                        self.variables == other.variables])
+                        self._vars == other._vars])
         except AttributeError:
             return False
 
@@ -0,0 +1,70 @@
+import collections
+
+
+class MappingProxy(collections.Mapping):
+    """
+    A read-only view of a dictionary.
+
+    The view does not copy the dictionary, so it reflects later changes to it. Use ``copy`` to take a snapshot.
+    """
+    def __init__(self, data):
+        """
+        Initializes a MappingProxy.
+
+        Args:
+            data (dict): The dictionary to expose.
+        """
+        self._data = data
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        return self._data.get(key, default)
+
+    def keys(self):
+        return self._data.keys()
+
+    def values(self):
+        return self._data.values()
+
+    def items(self):
+        return self._data.items()
+
+    def iterkeys(self):
+        return self._data.iterkeys()
+
+    def itervalues(self):
+        return self._data.itervalues()
+
+    def iteritems(self):
+        return self._data.iteritems()
+
+    def copy(self):
+        """
+        Returns:
+            A new dictionary with the contents of the view.
+        """
+        return self._data.copy()
+
+    def __eq__(self, other):
+        if isinstance(other, MappingProxy):
+            other = other._data
+        elif not isinstance(other, dict):
+            return collections.Mapping.__eq__(self, other)
+        return self._data == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return '{0}({1!r})'.format(self.__class__.__name__, self._data)
@@ -1,6 +1,9 @@
 import shlex
 import logging
 
+from .mapping_proxy import MappingProxy
+from .sequence_proxy import SequenceProxy
+
 
 _LOG = logging.getLogger(__name__)
 
@@ -12,6 +15,8 @@ class RuntimeProfile(object):
     RuntimeProfile aims to encapsulate the details of executing an app in a specific
     environment with specific argumentation.
     """
+    __slots__ = ('_name', '_app', '_environment', '_args', '_kwargs', '_description', '__weakref__')
+
     @property
     def name(self):
         """
@@ -91,12 +96,24 @@ class RuntimeProfile(object):
         Returns:
             A list of strings.
         """
-        return self._args[:]
+        return list(self._args)
 
     @arguments.setter
     def arguments(self, value):
         self._update_args(value)
 
+    @property
+    def arguments_view(self):
+        """
+        A read-only view of the Argumentation to be passed to the class::`App`.
+
+        Unlike ``arguments``, the view does not copy the data and reflects later changes to it.
+
+        Returns:
+            A class::`SequenceProxy` of strings.
+        """
+        return SequenceProxy(self._args)
+
     @property
     def keyword_arguments(self):
         """
@@ -111,6 +128,18 @@ class RuntimeProfile(object):
     def keyword_arguments(self, value):
         self._update_kwargs(value)
 
+    @property
+    def keyword_arguments_view(self):
+        """
+        A read-only view of the Keyword Argumentation to be passed to the class::`App`.
+
+        Unlike ``keyword_arguments``, the view does not copy the data and reflects later changes to it.
+
+        Returns:
+            A class::`MappingProxy` of string keys and string values.
+        """
+        return MappingProxy(self._kwargs)
+
     @property
     def description(self):
         """
@@ -161,18 +190,20 @@ class RuntimeProfile(object):
             args = shlex.split(args)
         args = [unicode(v).strip() for v in args]
 
-        added_args = set(args).difference(self._args)
         dropped_args = set(self._args).difference(args)
-
-        self._args.extend(added_args)
+        added_args = []
+        seen = set(self._args)
+        for arg in args:
+            if arg not in seen:
+                seen.add(arg)
+                added_args.append(arg)
+
+        self._args[:] = [a for a in self._args if a not in dropped_args] + added_args
         for arg in added_args:
-            msg = 'Updated {0} "{1}": ADD arg "{2}"'.format(self.__class__.__name__, self.name, arg)
-            _LOG.debug(msg)
+            _LOG.debug('Updated %s "%s": ADD arg "%s"', self.__class__.__name__, self.name, arg)
 
-        self._args = [a for a in self._args if a not in dropped_args]
         for arg in dropped_args:
-            msg = 'Updated {0} "{1}": REM arg "{2}"'.format(self.__class__.__name__, self.name, arg)
-            _LOG.debug(msg)
+            _LOG.debug('Updated %s "%s": REM arg "%s"', self.__class__.__name__, self.name, arg)
 
     def _update_kwargs(self, kwargs):
         if isinstance(kwargs, basestring):
@@ -192,20 +223,33 @@ class RuntimeProfile(object):
 
         for kw, arg in zip(added_args, [unicode(kwargs[kw]).strip() for kw in added_args]):
             self._kwargs[kw] = arg
-            msg = 'Updated {0} "{1}": ADD kwarg "{2}" - "{3}"'.format(self.__class__.__name__, self.name, kw, arg)
-            _LOG.debug(msg)
+            _LOG.debug('Updated %s "%s": ADD kwarg "%s" - "%s"', self.__class__.__name__, self.name, kw, arg)
 
         for kw, arg in zip(modded_args, [unicode(kwargs[kw]).strip() for kw in modded_args]):
             if self._kwargs[kw] == arg:
                 continue
             self._kwargs[kw] = arg
-            msg = 'Updated {0} "{1}": MOD kwarg "{2}" - "{3}"'.format(self.__class__.__name__, self.name, kw, arg)
-            _LOG.debug(msg)
+            _LOG.debug('Updated %s "%s": MOD kwarg "%s" - "%s"', self.__class__.__name__, self.name, kw, arg)
 
         for kw in dropped_args:
             del self._kwargs[kw]
-            msg = 'Updated {0} "{0}": REM kwarg "{2}"'.format(self.__class__.__name__, self.name, kw)
-            _LOG.debug(msg)
+            _LOG.debug('Updated %s "%s": REM kwarg "%s"', self.__class__.__name__, self.name, kw)
+
+    def __getstate__(self):
+        return {'_name': self._name,
+                '_app': self._app,
+                '_environment': self._environment,
+                '_args': list(self._args),
+                '_kwargs': self._kwargs.copy(),
+                '_description': self._description}
+
+    def __setstate__(self, state):
+        self._name = state['_name']
+        self._app = state['_app']
+        self._environment = state['_environment']
+        self._args = list(state.get('_args', ()))
+        self._kwargs = dict(state.get('_kwargs', {}))
+        self._description = state.get('_description')
 
     def __eq__(self, other):
         try:
@@ -0,0 +1,63 @@
+import collections
+
+
+class SequenceProxy(collections.Sequence):
+    """
+    A read-only view of a list.
+
+    The view does not copy the list, so it reflects later changes to it. Use ``copy`` to take a snapshot.
+    """
+    __hash__ = None
+
+    def __init__(self, data):
+        """
+        Initializes a SequenceProxy.
+
+        Args:
+            data (list): The list to expose.
+        """
+        self._data = data
+
+    def __getitem__(self, index):
+        return self._data[index]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __reversed__(self):
+        return reversed(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, value):
+        return value in self._data
+
+    def index(self, value):
+        return self._data.index(value)
+
+    def count(self, value):
+        return self._data.count(value)
+
+    def copy(self):
+        """
+        Returns:
+            A new list with the contents of the view.
+        """
+        return list(self._data)
+
+    def __eq__(self, other):
+        if isinstance(other, SequenceProxy):
+            other = other._data
+        elif not isinstance(other, (list, tuple)):
+            return NotImplemented
+        return len(self._data) == len(other) and all(a == b for a, b in zip(self._data, other))
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    def __repr__(self):
+        return '{0}({1!r})'.format(self.__class__.__name__, self._data)
@@ -0,0 +1,254 @@
+import itertools
+import os
+import re
+import logging
+
+
+_LOG = logging.getLogger(__name__)
+
+if os.name == 'nt':
+    _VAR_PATTERN = re.compile(r'\$(?:(?P<name>\w+)|\{(?P<braced>[^}]*)\})|%(?P<percent>\w+)%')
+else:
+    _VAR_PATTERN = re.compile(r'\$(?:(?P<name>\w+)|\{(?P<braced>[^}]*)\})')
+
+_snapshot_state = {'current': (None, None)}
+
+_ENVIRON_SERIALS = itertools.count(1)
+
+
+class _TrackedDict(dict):
+    """
+    The storage behind ``os.environ`` while ``set_environ_tracking`` is enabled, numbering every change so it can be
+    detected without comparing contents.
+    """
+    __slots__ = ('serial',)
+
+    def __init__(self, *args, **kwargs):
+        super(_TrackedDict, self).__init__(*args, **kwargs)
+        self.serial = next(_ENVIRON_SERIALS)
+
+    def _changed(self):
+        self.serial = next(_ENVIRON_SERIALS)
+
+    def __setitem__(self, key, value):
+        super(_TrackedDict, self).__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        super(_TrackedDict, self).__delitem__(key)
+        self._changed()
+
+    def clear(self):
+        super(_TrackedDict, self).clear()
+        self._changed()
+
+    def pop(self, key, *args):
+        result = super(_TrackedDict, self).pop(key, *args)
+        self._changed()
+        return result
+
+    def popitem(self):
+        result = super(_TrackedDict, self).popitem()
+        self._changed()
+        return result
+
+    def setdefault(self, key, default=None):
+        result = super(_TrackedDict, self).setdefault(key, default)
+        self._changed()
+        return result
+
+    def update(self, *args, **kwargs):
+        super(_TrackedDict, self).update(*args, **kwargs)
+        self._changed()
+
+
+def _get_environ_data():
+    return getattr(os.environ, 'data', os.environ)
+
+
+def set_environ_tracking(enabled):
+    """
+    Turns change tracking of ``os.environ`` on or off.
+
+    By default ``get_runtime_environment`` compares ``os.environ`` with the current snapshot's copy on every call,
+    which costs time proportional to the number of variables. When tracking is enabled, the dictionary behind
+    ``os.environ`` is replaced with a subclass holding the same data that numbers every change made through
+    ``os.environ``, and the comparison is skipped while that number is unchanged.
+
+    This changes ``os.environ`` for the whole process, so it is off by default. If ``os.environ`` or its data is
+    later replaced, changes are detected by comparison again. Like ``os.environ`` itself, neither mode sees
+    variables set with ``os.putenv``.
+
+    Args:
+        enabled (bool): True to track changes to ``os.environ``.
+    """
+    environ_data = getattr(os.environ, 'data', None)
+    if enabled:
+        if type(environ_data) is dict:
+            os.environ.data = _TrackedDict(environ_data)
+    elif isinstance(environ_data, _TrackedDict):
+        os.environ.data = dict(environ_data)
+
+
+def is_environ_tracking():
+    """
+    Returns:
+        True if changes to ``os.environ`` are being tracked.
+    """
+    return isinstance(getattr(os.environ, 'data', None), _TrackedDict)
+
+
+def _get_environ_fingerprint():
+    """
+    Identifies the contents of ``os.environ`` in constant time, if ``set_environ_tracking`` is enabled.
+
+    Returns:
+        A number that changes whenever ``os.environ`` changes, or None if changes are not being tracked.
+    """
+    data = _get_environ_data()
+    if isinstance(data, _TrackedDict):
+        return data.serial
+    return None
+
+
+class RuntimeEnvironment(object):
+    """
+    An immutable snapshot of the process environment, ``os.environ``.
+
+    Every value in the snapshot is expanded against the snapshot itself when it is taken, so substituting a runtime
+    variable is a single dictionary lookup. Snapshots are shared process-wide; use ``get_runtime_environment`` to
+    retrieve the snapshot matching the current process environment.
+    """
+    @property
+    def version(self):
+        """
+        Identifies the snapshot. Each new snapshot has a higher version than the last.
+        """
+        return self._version
+
+    @property
+    def variables(self):
+        """
+        The environment variables as they appeared in ``os.environ``.
+
+        Returns:
+            A dictionary with variable name keys and variable value values.
+        """
+        return self._variables.copy()
+
+    @property
+    def expanded_variables(self):
+        """
+        The environment variables with any references to other environment variables expanded.
+
+        Returns:
+            A dictionary with variable name keys and expanded variable value values.
+        """
+        return self._expanded.copy()
+
+    def __init__(self, variables, version=0):
+        """
+        Takes a snapshot of environment variable data.
+
+        Args:
+            variables ({str:str}): Environment variable names and values. The mapping is copied.
+            version (int): Identifies the snapshot.
+        """
+        super(RuntimeEnvironment, self).__init__()
+
+        self._version = version
+        self._variables = dict(variables)
+        self._expanded = {}
+
+        for name, value in self._variables.iteritems():
+            self._expanded[name] = self._expand_variable(value)
+
+    def _expand_variable(self, value):
+        seen = set()
+        while True:
+            expanded = _VAR_PATTERN.sub(self._substitute_raw, value)
+            if expanded == value or expanded in seen:
+                return expanded
+            seen.add(value)
+            value = expanded
+
+    def _substitute_raw(self, match):
+        try:
+            return self._variables[match.group(match.lastgroup)]
+        except KeyError:
+            return match.group(0)
+
+    def _substitute(self, match):
+        try:
+            return self._expanded[match.group(match.lastgroup)]
+        except KeyError:
+            return match.group(0)
+
+    def expandvars(self, value):
+        """
+        Replaces references to environment variables with their expanded values.
+
+        Follows the syntax of ``os.path.expandvars`` for the current platform. Unknown variables are left unchanged.
+        Because the snapshot's values are already expanded, a single pass over ``value`` is enough.
+
+        Args:
+            value (str): A string containing environment variable references.
+
+        Returns:
+            The string with environment variables expanded.
+        """
+        if '$' not in value and '%' not in value:
+            return value
+        return _VAR_PATTERN.sub(self._substitute, value)
+
+    def is_current(self):
+        """
+        Checks whether the snapshot still matches ``os.environ``.
+
+        Returns:
+            True if the process environment has not changed since the snapshot was taken.
+        """
+        fingerprint, snapshot = _snapshot_state['current']
+        if snapshot is self and fingerprint is not None and fingerprint == _get_environ_fingerprint():
+            return True
+        return _get_environ_data() == self._variables
+
+    def iteritems(self):
+        return self._expanded.iteritems()
+
+    def __len__(self):
+        return len(self._expanded)
+
+    def __getitem__(self, name):
+        return self._expanded[name]
+
+    def __contains__(self, name):
+        return name in self._expanded
+
+    def __iter__(self):
+        return self._expanded.iterkeys()
+
+
+def get_runtime_environment():
+    """
+    Retrieves the snapshot of the current process environment.
+
+    The snapshot is reused until the contents of ``os.environ`` change, which is detected by comparing
+    ``os.environ`` with the snapshot's copy. See ``set_environ_tracking`` to skip the comparison while
+    ``os.environ`` is unchanged.
+
+    Returns:
+        A class::`RuntimeEnvironment` instance.
+    """
+    fingerprint = _get_environ_fingerprint()
+    current_fingerprint, snapshot = _snapshot_state['current']
+    if fingerprint is not None and fingerprint == current_fingerprint:
+        return snapshot
+
+    data = _get_environ_data()
+    if snapshot is None or data != snapshot._variables:
+        version = snapshot.version + 1 if snapshot is not None else 1
+        snapshot = RuntimeEnvironment(data, version=version)
+        _LOG.debug('Runtime Environment Snapshot: version %s', version)
+    _snapshot_state['current'] = (fingerprint, snapshot)
+    return snapshot
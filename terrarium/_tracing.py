@@ -0,0 +1,105 @@
+"""Trace hooks around Terrarium operations and a Chrome trace exporter.
+
+Hooks installed with ``add_hook`` receive a class::`Span` when each instrumented operation starts and finishes.
+class::`ChromeTraceExporter` collects spans and writes them in the Chrome trace event format, which can be opened
+with chrome://tracing or any compatible viewer.
+
+"""
+import json
+import os
+import threading
+
+from ._instrumentation import Span, add_hook, remove_hook
+
+
+__all__ = ['Span', 'add_hook', 'remove_hook', 'ChromeTraceExporter']
+
+
+class ChromeTraceExporter(object):
+    """
+    Records finished spans and writes them to a file as Chrome trace JSON.
+
+    The exporter may be used as a context manager, which installs it on entry and writes the trace on exit.
+    """
+    def __init__(self, path):
+        """
+        Initializes a ChromeTraceExporter.
+
+        Args:
+            path (str): The file the trace is written to.
+        """
+        super(ChromeTraceExporter, self).__init__()
+
+        self._path = path
+        self._events = []
+        self._lock = threading.Lock()
+        self._handle = None
+
+    @property
+    def path(self):
+        """
+        The file the trace is written to.
+        """
+        return self._path
+
+    @property
+    def events(self):
+        """
+        The trace events recorded so far.
+
+        Returns:
+            A list of dictionaries in the Chrome trace event format.
+        """
+        with self._lock:
+            return list(self._events)
+
+    def install(self):
+        """
+        Starts recording spans.
+        """
+        if self._handle is None:
+            self._handle = add_hook(after=self._record)
+
+    def uninstall(self):
+        """
+        Stops recording spans. Recorded events are kept.
+        """
+        if self._handle is not None:
+            remove_hook(self._handle)
+            self._handle = None
+
+    def write(self):
+        """
+        Writes the recorded events to ``path``.
+        """
+        with open(self._path, 'w') as trace_file:
+            json.dump({'traceEvents': self.events, 'displayTimeUnit': 'ms'}, trace_file)
+
+    def _record(self, span):
+        args = {}
+        if span.resource_type is not None:
+            args['type'] = span.resource_type
+        if span.resource_name is not None:
+            args['name'] = span.resource_name
+        if span.error is not None:
+            args['error'] = repr(span.error)
+
+        event = {'name': span.operation,
+                 'cat': span.resource_type or 'terrarium',
+                 'ph': 'X',
+                 'ts': span.start * 1e6,
+                 'dur': span.duration * 1e6,
+                 'pid': os.getpid(),
+                 'tid': span.thread_id,
+                 'args': args}
+
+        with self._lock:
+            self._events.append(event)
+
+    def __enter__(self):
+        self.install()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.uninstall()
+        self.write()
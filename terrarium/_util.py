@@ -1,23 +1,101 @@
 import subprocess
 import os
 import logging
+import sys
 
+from ._cache import LRUCache
 from ._resource_managers import AppManager
 from ._resource_managers import EnvironmentManager
 from ._resource_managers import RuntimeProfileManager
+from ._runtime_environment import get_runtime_environment
 from ._errors import *
+from ._instrumentation import describe_name, instrumented
+from ._metrics import record_cache
 
 _LOG = logging.getLogger(__name__)
 
 _FMT_CMD_SET = 'SET {0} {1}\n'.format
 _FMT_CMD_RUN = 'RUN {0}\n'.format
 
+_ENVIRON_CACHE_SIZE = 64
+_environ_cache = LRUCache(_ENVIRON_CACHE_SIZE)
 
+
+class AppliedEnvironment(object):
+    """
+    Records the changes ``apply_environment`` made to the current runtime environment.
+
+    Use ``restore`` to put back exactly the values that were replaced, or use the instance as a context manager to
+    restore them automatically on exit.
+    """
+    @property
+    def environment(self):
+        """
+        The name of the applied Environment.
+        """
+        return self._environment
+
+    @property
+    def changed(self):
+        """
+        The names of the variables that were changed.
+
+        Returns:
+            A sorted list of variable names.
+        """
+        return sorted(self._previous_values)
+
+    def __init__(self, environment, previous_values):
+        """
+        Initializes an AppliedEnvironment.
+
+        Args:
+            environment (string): Name of the applied Environment
+            previous_values ({str:str}): Values the changed variables had before being applied.
+                None marks a variable that did not exist.
+        """
+        super(AppliedEnvironment, self).__init__()
+
+        self._environment = environment
+        self._previous_values = previous_values
+
+    def restore(self):
+        """
+        Reverts the changed variables to their previous values.
+
+        Restoring more than once has no further effect.
+        """
+        _restore_environ(self._previous_values)
+        self._previous_values = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.restore()
+        return False
+
+
+def _restore_environ(previous_values):
+    for name, value in previous_values.iteritems():
+        if value is None:
+            os.environ.pop(name, None)
+        else:
+            os.environ[name] = value
+
+
+@instrumented('apply_environment', describe=describe_name('Environment'))
 def apply_environment(environment, overrides=None):
     """
     Pushes the Environment instance's variable data into the current runtime environment.
 
-    If a failure occurs while applying a value, any previous value changes will be reverted.
+    Only variables whose value differs from the current runtime environment are written. If a failure occurs while
+    applying a value, any previous value changes will be reverted.
+
+    The returned class::`AppliedEnvironment` can restore the prior state, either explicitly or as a context manager::
+
+        with apply_environment('Shot'):
+            run_tool()
 
     Args:
         environment (string): Name of an existing Environment
@@ -28,32 +106,25 @@ def apply_environment(environment, overrides=None):
             Environment instance, it will not be used at all.
 
     Return:
-        None
+        An class::`AppliedEnvironment` instance.
     """
-    if not overrides:
-        overrides = {}
-
     try:
         env = EnvironmentManager.get_environment(environment)
-    except KeyError:
+    except ResourceNotFoundError:
         msg = 'Failed to apply environment: Environment "{0}" not found'.format(environment)
         _LOG.error(msg)
         raise ResourceNotFoundError(msg)
 
-    original_env = {}
+    values = env.resolve_all(overrides=overrides)
 
-    for name, value in env.iteritems():
-        try:
-            value = overrides[name]
-        except KeyError:
-            pass
-        else:
-            value = env.expand(value)
+    previous_values = {}
 
-        try:
-            original_env[name] = os.environ[name]
-        except KeyError:
-            original_env[name] = None
+    for name, value in values.iteritems():
+        orig_value = os.environ.get(name)
+        if orig_value == value:
+            continue
+
+        previous_values[name] = orig_value
 
         try:
             os.environ[name] = value
@@ -62,15 +133,71 @@ def apply_environment(environment, overrides=None):
             msg = msg.format(environment, name, value, e)
             _LOG.error(msg)
 
-            for orig_name, orig_value in original_env.iteritems():
-                if orig_value is None:
-                    del os.environ[orig_name]
-                else:
-                    os.environ[orig_name] = orig_value
+            _restore_environ(previous_values)
 
             raise RuntimeError(msg)
 
+    return AppliedEnvironment(environment, previous_values)
+
 
+@instrumented('materialize_environ', describe=describe_name('Environment'))
+def materialize_environ(environment, overrides=None, inherit=True):
+    """
+    Computes the complete set of environment variables a process should run with.
+
+    The result is cached per Environment state, overrides and process environment, so repeated launches of the
+    same Environment only pay for building it once.
+
+    Args:
+        environment (string): Name of an existing Environment
+        overrides ({str:str}): Mapping of environment variable names and
+            values. If a variable name key matches an environment variable
+            defined in the Environment instance, the value from the
+            override map is used. If an override has no match in the
+            Environment instance, it will not be used at all.
+        inherit (bool): If True, the variables of the current process
+            environment are included. Variables defined by the Environment
+            take precedence.
+
+    Returns:
+        A dictionary of variable names and fully expanded values, suitable for the ``env`` argument of
+        ``subprocess.Popen``. Names and values are native ``str``, encoded with the file system encoding, since
+        ``subprocess`` rejects ``unicode`` environments on Windows.
+    """
+    try:
+        env = EnvironmentManager.get_environment(environment)
+    except ResourceNotFoundError:
+        msg = 'Failed to materialize environment: Environment "{0}" not found'.format(environment)
+        _LOG.error(msg)
+        raise ResourceNotFoundError(msg)
+
+    runtime_environment = get_runtime_environment()
+    # Variables are expanded against the process environment even when it is not inherited, so the snapshot version
+    # is always part of the key.
+    cache_key = (env._get_state(), frozenset(overrides.iteritems()) if overrides else None,
+                 runtime_environment.version, inherit)
+
+    result = _environ_cache.get(cache_key)
+    record_cache('materialize_environ', result is not None)
+    if result is None:
+        if inherit:
+            result = runtime_environment.variables
+        else:
+            result = {}
+        result.update(env.resolve_all(overrides=overrides))
+        result = dict((_to_native(name), _to_native(value)) for name, value in result.iteritems())
+        _environ_cache.set(cache_key, result)
+
+    return result.copy()
+
+
+def _to_native(value):
+    if isinstance(value, unicode):
+        return value.encode(sys.getfilesystemencoding() or 'utf-8')
+    return value
+
+
+@instrumented('build_cmd', describe=describe_name('RuntimeProfile'))
 def build_cmd(runtime_profile):
     """
     Computes a command line call string that will run the application.
@@ -85,12 +212,19 @@ def build_cmd(runtime_profile):
     app = AppManager.get_app(profile.app)
     env = EnvironmentManager.get_environment(profile.environment)
 
-    result = [os.path.join(env.expand(app.location, app.executable))]
-    result.extend([env.expand(arg) for arg in profile.arguments])
-    for k, v in profile.keyword_arguments.iteritems():
+    args = profile.arguments_view
+    kwargs = profile.keyword_arguments_view.items()
+
+    values = [app.location, app.executable]
+    values.extend(args)
+    values.extend(v for k, v in kwargs)
+    values = env.expand_many(values)
+
+    result = [os.path.join(values[0], values[1])]
+    result.extend(values[2:2 + len(args)])
+    for (k, _), v in zip(kwargs, values[2 + len(args):]):
         if k[0] != '-':
             k = '-{0}'.format(k)
-        v = env.expand(v)
         result.append(k)
         result.append(v)
     result = ' '.join(result)
@@ -98,6 +232,7 @@ def build_cmd(runtime_profile):
     return result
 
 
+@instrumented('execute', describe=describe_name('RuntimeProfile'))
 def execute(runtime_profile):
     """
     Runs an application using the data from the runtime profile.
@@ -106,10 +241,10 @@ def execute(runtime_profile):
         runtime_profile (string): Name of an existing RuntimeProfile
     """
     profile = RuntimeProfileManager.get_runtime_profile(runtime_profile)
-    env = EnvironmentManager.get_environment(profile.environment)
+    environ = materialize_environ(profile.environment)
 
     cmd = build_cmd(runtime_profile)
-    subprocess.Popen(cmd, env=env)
+    subprocess.Popen(cmd, env=environ)
 
 
 def generate_bat(runtime_profile, output_path):
@@ -125,11 +260,11 @@ def generate_bat(runtime_profile, output_path):
 
     lines = []
 
-    for name, value in env.iteritems():
+    for name, value in env.resolve_all().iteritems():
         line = _FMT_CMD_SET(name, value)
         lines.append(line)
 
-    line = profile.build_cmd()
+    line = build_cmd(runtime_profile)
     lines.append(line)
 
     with open(output_path, 'w') as bat:
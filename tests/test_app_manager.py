@@ -1,5 +1,6 @@
 import gc
 import logging
+import os
 
 import pytest
 
@@ -8,6 +9,27 @@ import terrarium
 _LOG = logging.getLogger(__name__)
 
 
+class _CountingName(unicode):
+    """A resource name that counts how often it is converted to text."""
+    conversions = 0
+
+    def _count(self):
+        _CountingName.conversions += 1
+        return unicode(self[:])
+
+    def __format__(self, spec):
+        return format(self._count(), spec)
+
+    def __str__(self):
+        return str(self._count())
+
+    def __unicode__(self):
+        return self._count()
+
+    def __repr__(self):
+        return repr(self._count())
+
+
 @pytest.fixture
 def _app(request):
     _LOG.debug('create _app')
@@ -76,5 +98,178 @@ def test_app_update_description(_app):
     assert _app.description == 'This is a Pass App!'
 
 
+def test_app_find_by_executable(_app):
+    assert terrarium.AppManager.find_apps_by_executable('Test.exe') == [_app]
+    assert terrarium.AppManager.find_apps_by_location('%ROOT%') == [_app]
+
+    terrarium.AppManager.update_app('Test', new_executable='Pass.exe')
+
+    assert terrarium.AppManager.find_apps_by_executable('Test.exe') == []
+    assert terrarium.AppManager.find_apps_by_executable('Pass.exe') == [_app]
+
+
+def test_app_reindex(_app):
+    assert terrarium.AppManager.find_apps_by_executable('Test.exe') == [_app]
+
+    _app.executable = 'Direct.exe'
+    _app.description = 'Changed directly'
+    assert terrarium.AppManager.find_apps_by_executable('Direct.exe') == []
+
+    terrarium.AppManager.reindex()
+
+    assert terrarium.AppManager.find_apps_by_executable('Test.exe') == []
+    assert terrarium.AppManager.find_apps_by_executable('Direct.exe') == [_app]
+    assert terrarium.AppManager.search_apps('directly') == [_app]
+
+
+def test_app_find(_app):
+    assert terrarium.AppManager.find_apps('^Te') == [_app]
+
+    result = terrarium.AppManager.find_apps('^Te')
+    result.append(None)
+    assert terrarium.AppManager.find_apps('^Te') == [_app]
+
+    terrarium.AppManager.update_app('Test', new_name='Pass')
+    assert terrarium.AppManager.find_apps('^Te') == []
+    assert terrarium.AppManager.find_apps('^Pa') == [_app]
+
+
+def test_app_search(_app):
+    other = terrarium.AppManager.create_app('Testbed', '%ROOT%', 'Testbed.exe', description='Scratch area')
+    try:
+        assert terrarium.AppManager.search_apps('TEST') == [_app, other]
+        assert terrarium.AppManager.search_apps('test', limit=1) == [_app]
+        assert terrarium.AppManager.search_apps('scratch') == [other]
+        assert terrarium.AppManager.search_apps('a test app') == [_app]
+        assert terrarium.AppManager.search_apps('bed') == [other]
+        assert terrarium.AppManager.search_apps('missing') == []
+
+        terrarium.AppManager.update_app('Test', new_name='Pass', new_description='Renamed')
+        assert terrarium.AppManager.search_apps('test app') == []
+        assert terrarium.AppManager.search_apps('renamed') == [_app]
+    finally:
+        terrarium.AppManager.delete_app('Testbed')
+
+    assert terrarium.AppManager.search_apps('scratch') == []
+
+
+def test_app_create_many(request):
+    manager = terrarium.AppManager
+    request.addfinalizer(lambda: manager.delete_many(['BatchA', 'BatchB', 'BatchC']))
+
+    apps = manager.create_many([{'name': 'BatchB', 'location': '%ROOT%', 'executable': 'b.exe'},
+                                {'name': 'BatchA', 'location': '%ROOT%', 'executable': 'a.exe',
+                                 'description': 'First'}])
+    assert [app.name for app in apps] == ['BatchB', 'BatchA']
+    assert manager.get_app('BatchA').description == 'First'
+    assert manager.find_apps('^Batch') == [apps[1], apps[0]]
+    assert manager.find_apps_by_executable('b.exe') == [apps[0]]
+
+    with pytest.raises(terrarium.ResourceAlreadyExistsError):
+        manager.create_many([{'name': 'BatchC', 'location': '%ROOT%', 'executable': 'c.exe'},
+                             {'name': 'BatchA', 'location': '%ROOT%', 'executable': 'a.exe'}])
+    with pytest.raises(terrarium.ResourceCreationError):
+        manager.create_many([{'name': 'BatchC', 'location': '%ROOT%', 'executable': 'c.exe'},
+                             {'name': 'BatchD', 'location': '', 'executable': 'd.exe'}])
+    assert manager.find_apps('^Batch') == [apps[1], apps[0]]
+
+
+def test_app_update_many(request):
+    manager = terrarium.AppManager
+    request.addfinalizer(lambda: manager.delete_many(['BatchA', 'BatchB', 'BatchC']))
+    app_a, app_b = manager.create_many([{'name': 'BatchA', 'location': '%ROOT%', 'executable': 'a.exe'},
+                                        {'name': 'BatchB', 'location': '%ROOT%', 'executable': 'b.exe'}])
+
+    manager.update_many([('BatchA', {'name': 'BatchC', 'executable': 'c.exe'}),
+                         ('BatchB', {'name': 'BatchA'})])
+    assert manager.find_apps('^Batch') == [app_b, app_a]
+    assert manager.get_app('BatchC') is app_a
+    assert manager.find_apps_by_executable('c.exe') == [app_a]
+
+    with pytest.raises(terrarium.ResourceUpdateError):
+        manager.update_many([('BatchC', {'name': 'BatchB', 'executable': 'x.exe'}),
+                             ('BatchA', {'name': 'BatchB'})])
+    with pytest.raises(terrarium.ResourceAttributeNotFoundError):
+        manager.update_many([('BatchC', {'executable': 'x.exe'}), ('BatchA', {'missing': 'x'})])
+    assert app_a.name == 'BatchC'
+    assert app_a.executable == 'c.exe'
+    assert manager.find_apps_by_executable('c.exe') == [app_a]
+    assert manager.find_apps_by_executable('x.exe') == []
+
+    manager.delete_many(['BatchA', 'BatchC', 'Missing'])
+    assert manager.find_apps('^Batch') == []
+
+
+def test_app_cascade_rename(_app, request):
+    profiles = terrarium.RuntimeProfileManager
+    profile = profiles.create_runtime_profile('TestAppProfile', 'Test', 'TestEnv', cmd_args=[], cmd_kwargs={})
+    request.addfinalizer(lambda: profiles.delete_runtime_profile('TestAppProfile'))
+
+    terrarium.AppManager.update_app('Test', new_name='Renamed')
+    assert profile.app == 'Test'
+
+    terrarium.AppManager.update_app('Renamed', new_name='Test', cascade=True)
+    terrarium.AppManager.update_app('Test', new_name='Pass', cascade=True)
+    assert profile.app == 'Pass'
+    assert terrarium.dependents_of(_app) == [profile]
+
+    terrarium.AppManager.delete_app('Pass', cascade=True)
+    assert profiles.find_runtime_profiles('^TestAppProfile$') == []
+
+
+def test_app_cascade_rename_atomic(_app, request, monkeypatch):
+    profiles = terrarium.RuntimeProfileManager
+    profile = profiles.create_runtime_profile('AtomicProfile', 'Test', 'TestEnv', cmd_args=[], cmd_kwargs={})
+    request.addfinalizer(lambda: profiles.delete_runtime_profile('AtomicProfile'))
+
+    events = []
+    terrarium.subscribe(events.append)
+    request.addfinalizer(lambda: terrarium.unsubscribe(events.append))
+
+    terrarium.AppManager.update_app('Test', new_name='Atomic', cascade=True)
+    assert [(type(e).__name__, e.name) for e in events] == [('ResourceRenamed', 'Atomic'),
+                                                            ('ResourceUpdated', 'AtomicProfile')]
+
+    def fail(cls, batch):
+        raise ValueError('Dependent rejected')
+    monkeypatch.setattr(profiles, '_apply_updates', classmethod(fail))
+    del events[:]
+
+    with pytest.raises(terrarium.ResourceUpdateError):
+        terrarium.AppManager.update_app('Atomic', new_name='Test', cascade=True)
+
+    assert events == []
+    assert _app.name == 'Atomic'
+    assert terrarium.AppManager.get_app('Atomic') is _app
+    assert terrarium.AppManager.find_apps('^Test$') == []
+    assert profile.app == 'Atomic'
+
+    monkeypatch.undo()
+    terrarium.AppManager.update_app('Atomic', new_name='Test', cascade=True)
+
+
+def test_app_retrieval_does_not_format(_app, request):
+    logger = logging.getLogger('terrarium')
+    level = logger.level
+    request.addfinalizer(lambda: logger.setLevel(level))
+    name = _CountingName('Test')
+
+    logger.setLevel(logging.INFO)
+    _CountingName.conversions = 0
+    for _ in xrange(100):
+        assert terrarium.AppManager.get_app(name) is _app
+    assert _CountingName.conversions == 0
+
+    logger.setLevel(logging.DEBUG)
+    handler = logging.StreamHandler(open(os.devnull, 'w'))
+    logger.addHandler(handler)
+    try:
+        terrarium.AppManager.get_app(name)
+    finally:
+        logger.removeHandler(handler)
+        handler.stream.close()
+    assert _CountingName.conversions > 0
+
+
 if __name__ == '__main__':
     pytest.main()
@@ -0,0 +1,37 @@
+import pytest
+
+from terrarium._cache import LRUCache
+
+
+def test_cache_eviction():
+    cache = LRUCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+
+    cache.set('c', 3)
+
+    assert 'a' in cache
+    assert 'b' not in cache
+    assert 'c' in cache
+    assert len(cache) == 2
+
+
+def test_cache_info():
+    cache = LRUCache(maxsize=4)
+    cache.set('a', 1)
+    cache.get('a')
+    cache.get('b')
+
+    info = cache.info()
+    assert info.hits == 1
+    assert info.misses == 1
+    assert info.maxsize == 4
+    assert info.currsize == 1
+
+    cache.clear()
+    assert cache.info().currsize == 0
+
+
+if __name__ == '__main__':
+    pytest.main()
@@ -0,0 +1,43 @@
+import pytest
+
+import terrarium
+
+
+def test_compiled_value_segments():
+    compiled = terrarium.CompiledValue('%ROOT%/$FOO/${BAR}/@[BAZ]@/end')
+
+    assert compiled.references == ('ROOT', 'FOO', 'BAR', 'BAZ')
+    assert compiled.segments == (terrarium.VariableReference('ROOT', '%ROOT%', False), '/',
+                                 terrarium.VariableReference('FOO', '$FOO', False), '/',
+                                 terrarium.VariableReference('BAR', '${BAR}', False), '/',
+                                 terrarium.VariableReference('BAZ', '@[BAZ]@', True), '/end')
+
+
+def test_compiled_value_literal():
+    compiled = terrarium.CompiledValue('50% of $')
+
+    assert compiled.references == ()
+    assert compiled.render(lambda reference: 'fail') == '50% of $'
+
+
+def test_compiled_value_internal_form():
+    compiled = terrarium.CompiledValue('%ROOT%/$FOO/${BAR}')
+
+    assert compiled.internal_form() == '@[ROOT]@/@[FOO]@/@[BAR]@'
+
+
+def test_compiled_value_sharing():
+    assert terrarium.CompiledValue.compile('$FOO') is terrarium.CompiledValue.compile('$FOO')
+
+
+def test_environment_expansion_of_compiled_value():
+    environment = terrarium.Environment('test')
+    environment['ROOT'] = 'C:'
+    environment['FOO'] = '%ROOT%/foo'
+
+    assert environment.get_compiled('FOO').references == ('ROOT',)
+    assert environment.expand(environment.get_compiled('FOO')) == environment.expand('%FOO%')
+
+
+if __name__ == '__main__':
+    pytest.main()
@@ -0,0 +1,199 @@
+import logging
+import sys
+import threading
+
+import pytest
+
+import terrarium
+from terrarium._cache import LRUCache
+from terrarium._lock import ReadWriteLock
+
+_LOG = logging.getLogger(__name__)
+
+_THREAD_COUNT = 8
+_ITERATIONS = 300
+
+
+@pytest.fixture
+def _thread_safe(request):
+    terrarium.set_thread_safe(True)
+
+    app = terrarium.AppManager.create_app('StressA', '%ROOT%', 'Stress.exe')
+
+    def fin():
+        terrarium.AppManager.delete_many(['StressA', 'StressB'])
+        terrarium.set_thread_safe(False)
+    request.addfinalizer(fin)
+
+    return app
+
+
+@pytest.fixture
+def _switch_often(request):
+    interval = sys.getcheckinterval()
+    sys.setcheckinterval(1)
+    request.addfinalizer(lambda: sys.setcheckinterval(interval))
+
+
+def _run_threads(targets):
+    errors = []
+
+    def run(target):
+        try:
+            target()
+        except Exception as e:
+            _LOG.exception('Stress thread failed')
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(target,)) for target in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return errors
+
+
+def test_lock_readers_share():
+    lock = ReadWriteLock()
+    entered = threading.Event()
+
+    def read():
+        with lock.reading():
+            entered.set()
+
+    with lock.reading():
+        thread = threading.Thread(target=read)
+        thread.start()
+        thread.join(5)
+
+        assert entered.is_set()
+
+
+def test_lock_reentrant():
+    lock = ReadWriteLock()
+
+    with lock.writing():
+        with lock.writing():
+            with lock.reading():
+                pass
+
+    with lock.reading():
+        with lock.reading():
+            with pytest.raises(RuntimeError):
+                lock.acquire_write()
+
+    with lock.writing():
+        pass
+
+
+def test_concurrent_rename(_thread_safe, _switch_often):
+    app = _thread_safe
+    manager = terrarium.AppManager
+
+    def rename():
+        for _ in xrange(_ITERATIONS):
+            name = app.name
+            manager.update_app(name, new_name='StressB' if name == 'StressA' else 'StressA')
+
+    def read():
+        for _ in xrange(_ITERATIONS):
+            assert manager.find_apps('^Stress[AB]$') == [app]
+            assert manager.find_apps_by_executable('Stress.exe') == [app]
+            assert [a.name for a in manager.iter_apps(terrarium.Matches('name', '^Stress'))] in (['StressA'],
+                                                                                               ['StressB'])
+
+    errors = _run_threads([read] * (_THREAD_COUNT - 1) + [rename])
+
+    assert errors == []
+    assert manager.get_app(app.name) is app
+
+
+def test_concurrent_subscriber(_thread_safe, request):
+    app = _thread_safe
+    manager = terrarium.AppManager
+    seen = []
+
+    def on_change(event):
+        reader = threading.Thread(target=lambda: seen.append(manager.get_app(event.name)))
+        reader.start()
+        reader.join(5)
+
+    terrarium.subscribe(on_change, manager=manager)
+    request.addfinalizer(lambda: terrarium.unsubscribe(on_change))
+
+    manager.update_app('StressA', new_name='StressB', cascade=True)
+    manager.update_many([('StressB', {'executable': 'Stress.exe'})])
+
+    assert seen == [app, app]
+
+
+def test_concurrent_create_delete(_thread_safe):
+    manager = terrarium.AppManager
+
+    def churn(index):
+        def run():
+            name = 'Churn{0}'.format(index)
+            for _ in xrange(_ITERATIONS):
+                manager.create_app(name, '%ROOT%', 'Churn.exe')
+                assert manager.get_app(name).name == name
+                manager.delete_app(name)
+        return run
+
+    def read():
+        for _ in xrange(_ITERATIONS):
+            apps = manager.find_apps('^Churn')
+            assert len(apps) == len(set(a.name for a in apps))
+            assert all(a.executable == 'Churn.exe' for a in apps)
+
+    errors = _run_threads([churn(i) for i in xrange(_THREAD_COUNT // 2)] + [read] * (_THREAD_COUNT // 2))
+
+    assert errors == []
+    assert manager.find_apps('^Churn') == []
+    assert manager.find_apps_by_executable('Churn.exe') == []
+
+
+def test_concurrent_cache(_switch_often):
+    cache = LRUCache(maxsize=16)
+
+    def use(index):
+        def run():
+            for i in xrange(_ITERATIONS * 10):
+                key = (index * 7 + i) % 24
+                if cache.get(key) is None:
+                    cache.set(key, key)
+        return run
+
+    errors = _run_threads([use(i) for i in xrange(_THREAD_COUNT)])
+
+    assert errors == []
+    root = cache._root
+    link = root[1]
+    count = 0
+    while link is not root:
+        assert link[1][0] is link
+        count += 1
+        link = link[1]
+    assert count == len(cache) <= 16
+
+
+def test_concurrent_find(_thread_safe, _switch_often, request):
+    manager = terrarium.AppManager
+    names = ['Many{0:02d}'.format(i) for i in xrange(50)]
+    manager.create_many([{'name': name, 'location': '%ROOT%', 'executable': 'Many.exe'} for name in names])
+    request.addfinalizer(lambda: manager.delete_many(names))
+
+    def read(index):
+        def run():
+            for i in xrange(_ITERATIONS):
+                name = names[(index * 11 + i) % len(names)]
+                assert manager.find_apps('^{0}$'.format(name)) == [manager.get_app(name)]
+        return run
+
+    errors = _run_threads([read(i) for i in xrange(_THREAD_COUNT)])
+
+    assert errors == []
+
+
+if __name__ == '__main__':
+    pytest.main()
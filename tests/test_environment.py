@@ -16,6 +16,28 @@ def test_environment_settings():
     assert environment['test_setting'] == 'success'
 
 
+def test_environment_variables_view():
+    environment = terrarium.Environment('test', variables={'ROOT': 'C:'})
+    view = environment.variables_view
+
+    assert view == {'ROOT': 'C:'}
+    assert view == environment.variables
+    with pytest.raises(TypeError):
+        view['ROOT'] = 'D:'
+
+    environment['TOOLS'] = 'D:'
+    assert sorted(view) == ['ROOT', 'TOOLS']
+    assert view.copy() == environment.variables
+
+
+def test_environment_equality():
+    environment = terrarium.Environment('test', variables={'ROOT': 'C:'})
+
+    assert environment == terrarium.Environment('test', variables={'ROOT': 'C:'})
+    assert environment != terrarium.Environment('test', variables={'ROOT': 'D:'})
+    assert environment != {'ROOT': 'C:'}
+
+
 def test_environment_set_empty_value():
     environment = terrarium.Environment('test')
     with pytest.raises(ValueError):
@@ -46,6 +68,43 @@ def test_environment_compression():
     assert result == os.path.normpath('$BAZ/end')
 
 
+def test_environment_compression_longest_match():
+    environment = terrarium.Environment('test')
+    environment['ROOT'] = 'C:/root'
+    environment['TOOLS'] = '%ROOT%/tools'
+    environment['TOOLBOX'] = '%ROOT%/toolbox'
+
+    result = environment.compress('C:/root/toolbox/a;C:/root/tools/b;C:/root/other',
+                                  var_format='${0}', use_runtime_environment=False)
+    assert result == os.path.normpath('$TOOLBOX/a;$TOOLS/b;$ROOT/other')
+
+
+def test_environment_compression_long_values(monkeypatch):
+    long_path = os.path.normpath('C:/' + '/'.join('dir{0}'.format(i) for i in xrange(1000)))
+    monkeypatch.setenv('COMPRESS_LONG', os.pathsep.join(['C:/a', 'C:/b'] * 2000))
+
+    environment = terrarium.Environment('test')
+    environment['ROOT'] = 'C:'
+    environment['DEEP'] = long_path
+    environment['NESTED'] = '%DEEP%/leaf'
+
+    result = environment.compress(long_path + '/leaf/end', var_format='${0}')
+    assert result == os.path.normpath('$NESTED/end')
+    assert environment.compress(long_path[:-1], var_format='${0}').startswith('$ROOT')
+
+    nested = terrarium.Environment('nested')
+    nested.update(('N{0}'.format(i), 'C:' + '/d' * (i + 1)) for i in xrange(600))
+    result = nested.compress('C:' + '/d' * 600 + '/x;C:/d/y', var_format='${0}', use_runtime_environment=False)
+    assert result == os.path.normpath('$N599/x;$N0/y')
+
+
+def test_environment_compression_without_variables():
+    environment = terrarium.Environment('test')
+
+    result = environment.compress('C:/foo/bar', use_runtime_environment=False)
+    assert result == os.path.normpath('C:/foo/bar')
+
+
 def test_environment_expansion_with_empty_value():
     environment = terrarium.Environment('test')
     environment['ROOT'] = 'C:'
@@ -74,5 +133,108 @@ def test_environment_compression_with_empty_value():
     assert result == os.path.normpath('$BAZ/end')
 
 
+def test_environment_expansion_cache():
+    environment = terrarium.Environment('test')
+    environment['ROOT'] = 'C:'
+    environment['FOO'] = '%ROOT%/foo'
+
+    assert environment.expand('%FOO%/end') == os.path.normpath('C:/foo/end')
+    assert environment.expand('%FOO%/end') == os.path.normpath('C:/foo/end')
+
+    info = environment.expansion_cache_info()
+    assert info.hits == 1
+    assert info.misses == 1
+    assert info.currsize == 1
+
+
+def test_environment_expansion_cache_invalidation():
+    environment = terrarium.Environment('test')
+    environment['ROOT'] = 'C:'
+    environment['FOO'] = '%ROOT%/foo'
+    assert environment.expand('%FOO%/end') == os.path.normpath('C:/foo/end')
+
+    environment['ROOT'] = 'D:'
+    assert environment.expand('%FOO%/end') == os.path.normpath('D:/foo/end')
+
+    environment.update({'ROOT': 'E:'})
+    assert environment.expand('%FOO%/end') == os.path.normpath('E:/foo/end')
+
+    del environment['FOO']
+    assert environment.expansion_cache_info().currsize == 0
+
+    environment.parent = 'Other'
+    assert environment.expansion_cache_info().currsize == 0
+
+
+def test_environment_expansion_cache_overrides():
+    environment = terrarium.Environment('test')
+    environment['ROOT'] = 'C:'
+
+    assert environment.expand('%ROOT%/end') == os.path.normpath('C:/end')
+    assert environment.expand('%ROOT%/end', overrides={'ROOT': 'D:'}) == os.path.normpath('D:/end')
+    assert environment.expand('%ROOT%/end') == os.path.normpath('C:/end')
+
+
+def test_environment_expand_many():
+    environment = terrarium.Environment('test')
+    environment['ROOT'] = 'C:'
+    environment['FOO'] = '%ROOT%/foo'
+
+    values = ['%FOO%/a', '$ROOT/b', terrarium.CompiledValue('${FOO}')]
+    result = environment.expand_many(values, use_runtime_environment=False)
+
+    assert result == [environment.expand(v, use_runtime_environment=False) for v in values]
+
+
+def test_environment_compress_many():
+    environment = terrarium.Environment('test')
+    environment['ROOT'] = 'C:'
+    environment['FOO'] = '%ROOT%/foo'
+
+    values = ['C:/foo/a', 'C:/b', 'D:/c']
+    result = environment.compress_many(values, var_format='${0}', use_runtime_environment=False)
+
+    assert result == [os.path.normpath('$FOO/a'), os.path.normpath('$ROOT/b'), os.path.normpath('D:/c')]
+
+
+def test_environment_resolve_all():
+    environment = terrarium.Environment('test')
+    environment['ROOT'] = 'C:'
+    environment['FOO'] = '%ROOT%/foo'
+    environment['BAR'] = '$FOO/bar'
+    environment['BAZ'] = '${BAR}/baz'
+
+    result = environment.resolve_all()
+    assert result == {'ROOT': 'C:',
+                      'FOO': os.path.normpath('C:/foo'),
+                      'BAR': os.path.normpath('C:/foo/bar'),
+                      'BAZ': os.path.normpath('C:/foo/bar/baz')}
+    assert dict(environment.iteritems()) == result
+
+
+def test_environment_resolve_all_overrides():
+    environment = terrarium.Environment('test')
+    environment['ROOT'] = 'C:'
+    environment['FOO'] = '%ROOT%/foo'
+
+    result = environment.resolve_all(overrides={'ROOT': 'D:', 'OTHER': 'unused'})
+    assert result == {'ROOT': 'D:', 'FOO': os.path.normpath('D:/foo')}
+
+
+def test_environment_variable_cycle():
+    environment = terrarium.Environment('test')
+    environment['FOO'] = '%BAR%/foo'
+    environment['BAR'] = '%BAZ%/bar'
+    environment['BAZ'] = '%FOO%/baz'
+
+    with pytest.raises(terrarium.VariableCycleError) as exc_info:
+        environment.resolve_all()
+    assert len(exc_info.value.cycle) == 4
+    assert exc_info.value.cycle[0] == exc_info.value.cycle[-1]
+
+    with pytest.raises(terrarium.VariableCycleError):
+        environment.expand('%FOO%')
+
+
 if __name__ == '__main__':
     pytest.main()
@@ -1,5 +1,6 @@
 import gc
 import logging
+import os
 
 import pytest
 
@@ -67,5 +68,163 @@ def test_env_update_description(_environment):
     assert _environment.description == 'This is a Pass Environment.'
 
 
+@pytest.fixture
+def _hierarchy(request):
+    _LOG.debug('create _hierarchy')
+
+    site = terrarium.EnvironmentManager.create_environment('Site', variables={'ROOT': 'C:', 'TOOLS': '%ROOT%/tools'})
+    show = terrarium.EnvironmentManager.create_environment('Show', parent='Site', variables={'SHOW': '%ROOT%/show'})
+    shot = terrarium.EnvironmentManager.create_environment('Shot', parent='Show', variables={'SHOT': '%SHOW%/shot'})
+
+    def fin():
+        for env in (site, show, shot):
+            terrarium.EnvironmentManager.delete_environment(env.name)
+        _LOG.debug('teardown _hierarchy')
+    request.addfinalizer(fin)
+
+    return site, show, shot
+
+
+def test_env_parent_resolution(_hierarchy):
+    site, show, shot = _hierarchy
+
+    assert shot.expand('%SHOT%') == os.path.normpath('C:/show/shot')
+    assert shot['TOOLS'] == os.path.normpath('@[ROOT]@/tools')
+    assert 'ROOT' in shot
+    assert shot.variables == {'SHOT': os.path.normpath('@[SHOW]@/shot')}
+    assert shot.resolve_all() == {'ROOT': 'C:',
+                                  'TOOLS': os.path.normpath('C:/tools'),
+                                  'SHOW': os.path.normpath('C:/show'),
+                                  'SHOT': os.path.normpath('C:/show/shot')}
+
+
+def test_env_parent_override(_hierarchy):
+    site, show, shot = _hierarchy
+
+    show['ROOT'] = 'D:'
+
+    assert site.expand('%ROOT%') == 'C:'
+    assert shot.expand('%SHOT%') == os.path.normpath('D:/show/shot')
+
+
+def test_env_ancestor_change(_hierarchy):
+    site, show, shot = _hierarchy
+
+    assert shot.expand('%SHOT%') == os.path.normpath('C:/show/shot')
+
+    site['ROOT'] = 'E:'
+    assert shot.expand('%SHOT%') == os.path.normpath('E:/show/shot')
+
+    terrarium.EnvironmentManager.update_environment('Site', new_name='OtherSite')
+    assert shot.expand('%SHOT%') == os.path.normpath('%ROOT%/show/shot')
+
+    terrarium.EnvironmentManager.update_environment('Show', new_parent='OtherSite')
+    assert shot.expand('%SHOT%') == os.path.normpath('E:/show/shot')
+
+
+def test_env_ancestor_membership(_hierarchy, request):
+    site, show, shot = _hierarchy
+
+    orphan = terrarium.Environment('Orphan', parent='Studio', variables={'JOB': '%STUDIO%/job'})
+    assert orphan.expand('%JOB%') == os.path.normpath('%STUDIO%/job')
+
+    flattened = shot._get_flattened_vars()
+    terrarium.EnvironmentManager.create_environment('Studio', variables={'STUDIO': 'S:'})
+    request.addfinalizer(lambda: terrarium.EnvironmentManager.delete_environment('Studio'))
+
+    assert orphan.expand('%JOB%') == os.path.normpath('S:/job')
+    assert shot._get_flattened_vars() is flattened
+
+    terrarium.EnvironmentManager.delete_environment('Studio')
+    assert orphan.expand('%JOB%') == os.path.normpath('%STUDIO%/job')
+
+
+def test_env_find_prefix(_hierarchy):
+    site, show, shot = _hierarchy
+
+    assert terrarium.EnvironmentManager.find_environments('^Sh') == [shot, show]
+    assert terrarium.EnvironmentManager.find_environments('Sho[tw]$') == [shot, show]
+    assert terrarium.EnvironmentManager.find_environments('Show?') == [shot, show]
+    assert terrarium.EnvironmentManager.find_environments('Sh.*t') == [shot]
+    assert terrarium.EnvironmentManager.find_environments('(?i)site') == [site]
+    assert terrarium.EnvironmentManager.find_environments('Site|Show') == [show, site]
+
+    terrarium.EnvironmentManager.update_environment('Shot', new_name='Take')
+
+    assert terrarium.EnvironmentManager.find_environments('^Sh') == [show]
+    assert terrarium.EnvironmentManager.find_environments('^Ta') == [shot]
+
+
+def test_env_iter_pages(_hierarchy):
+    site, show, shot = _hierarchy
+    manager = terrarium.EnvironmentManager
+
+    every = list(manager.iter_environments())
+    assert every == sorted(every, key=lambda e: e.name)
+    assert [shot, show, site] == [e for e in every if e in _hierarchy]
+
+    first = list(manager.iter_environments(limit=2))
+    rest = list(manager.iter_environments(start_after=first[-1].name))
+    assert first + rest == every
+    assert list(manager.iter_environments(offset=1, limit=1)) == every[1:2]
+
+    query = terrarium.Matches('name', '^S')
+    assert list(manager.iter_environments(query, limit=2)) == [shot, show]
+    assert list(manager.iter_environments(query, start_after='Shot')) == [show, site]
+
+    query = terrarium.Equals('parent', 'Site') | terrarium.Equals('parent', 'Show')
+    assert list(manager.iter_environments(query, limit=1)) == [shot]
+    assert list(manager.iter_environments(query, offset=1, limit=5)) == [show]
+    assert list(manager.iter_environments(query, limit=0)) == []
+
+
+def test_env_iter_during_changes(_hierarchy):
+    site, show, shot = _hierarchy
+    manager = terrarium.EnvironmentManager
+
+    iterator = manager.iter_environments(limit=3, start_after='Sh')
+    assert next(iterator) is shot
+    manager.delete_environment('Show')
+    manager.create_environment('Shp')
+    try:
+        assert list(iterator) == [manager.get_environment('Shp'), site]
+    finally:
+        manager.delete_environment('Shp')
+
+
+def test_env_dependents(_hierarchy, request):
+    site, show, shot = _hierarchy
+    profiles = terrarium.RuntimeProfileManager
+    profile = profiles.create_runtime_profile('ShotProfile', 'ShotApp', 'Shot', cmd_args=[], cmd_kwargs={})
+    request.addfinalizer(lambda: profiles.delete_runtime_profile('ShotProfile'))
+
+    assert terrarium.dependents_of(site) == [show]
+    assert terrarium.dependents_of(show) == [shot]
+    assert terrarium.dependents_of(shot) == [profile]
+    assert terrarium.dependents_of(profile) == []
+
+    terrarium.EnvironmentManager.update_environment('Shot', new_name='Take', cascade=True)
+    terrarium.EnvironmentManager.update_environment('Show', new_name='Episode', cascade=True)
+
+    assert shot.parent == 'Episode'
+    assert profile.environment == 'Take'
+    assert terrarium.dependents_of(show) == [shot]
+    assert shot.expand('%SHOT%') == os.path.normpath('C:/show/shot')
+    assert profiles.find_runtime_profiles_by_environment('Take') == [profile]
+
+
+def test_env_cascade_delete(_hierarchy, request):
+    site, show, shot = _hierarchy
+    profiles = terrarium.RuntimeProfileManager
+    profiles.create_runtime_profile('ShotProfile', 'ShotApp', 'Shot', cmd_args=[], cmd_kwargs={})
+    request.addfinalizer(lambda: profiles.delete_runtime_profile('ShotProfile'))
+
+    terrarium.EnvironmentManager.delete_environment('Show', cascade=True)
+
+    assert terrarium.EnvironmentManager.find_environments('^S') == [site]
+    assert profiles.find_runtime_profiles('^ShotProfile$') == []
+    assert terrarium.dependents_of(site) == []
+
+
 if __name__ == '__main__':
     pytest.main()
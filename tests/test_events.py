@@ -0,0 +1,105 @@
+import logging
+
+import pytest
+
+import terrarium
+
+_LOG = logging.getLogger(__name__)
+
+
+@pytest.fixture
+def _events(request):
+    events = []
+    terrarium.subscribe(events.append, manager=terrarium.AppManager)
+
+    def fin():
+        terrarium.unsubscribe(events.append)
+        terrarium.AppManager.delete_many(['EventA', 'EventB', 'EventC'])
+    request.addfinalizer(fin)
+
+    return events
+
+
+def _describe(events):
+    return [(type(e).__name__, e.name, e.old_name) for e in events]
+
+
+def test_events_published(_events):
+    app = terrarium.AppManager.create_app('EventA', '%ROOT%', 'Event.exe')
+    terrarium.AppManager.update_app('EventA', new_executable='Other.exe')
+    terrarium.AppManager.update_app('EventA', new_name='EventB')
+    terrarium.AppManager.delete_app('EventB')
+    terrarium.AppManager.delete_app('EventB')
+
+    assert _describe(_events) == [('ResourceCreated', 'EventA', None),
+                                  ('ResourceUpdated', 'EventA', None),
+                                  ('ResourceRenamed', 'EventB', 'EventA'),
+                                  ('ResourceDeleted', 'EventB', None)]
+    assert all(e.resource is app and e.manager is terrarium.AppManager for e in _events)
+
+
+def test_events_filtered(_events):
+    renames = []
+    terrarium.subscribe(renames.append, event_types=[terrarium.ResourceRenamed])
+    try:
+        terrarium.EnvironmentManager.create_environment('EventEnv')
+        terrarium.EnvironmentManager.update_environment('EventEnv', new_name='EventEnvB')
+        terrarium.EnvironmentManager.delete_environment('EventEnvB')
+    finally:
+        terrarium.unsubscribe(renames.append)
+
+    assert _events == []
+    assert _describe(renames) == [('ResourceRenamed', 'EventEnvB', 'EventEnv')]
+
+
+def test_events_batched(_events):
+    with terrarium.batch_events():
+        terrarium.AppManager.create_many([{'name': 'EventA', 'location': '%ROOT%', 'executable': 'a.exe'},
+                                          {'name': 'EventC', 'location': '%ROOT%', 'executable': 'c.exe'}])
+        terrarium.AppManager.update_app('EventA', new_executable='b.exe')
+        with terrarium.batch_events():
+            terrarium.AppManager.create_app('EventB', '%ROOT%', 'b.exe')
+            terrarium.AppManager.delete_app('EventB')
+        assert _events == []
+
+    assert _describe(_events) == [('ResourceCreated', 'EventA', None),
+                                  ('ResourceCreated', 'EventC', None)]
+
+    del _events[:]
+    with terrarium.batch_events():
+        terrarium.AppManager.update_app('EventA', new_name='EventB')
+        terrarium.AppManager.update_app('EventB', new_name='EventD', new_executable='d.exe')
+        terrarium.AppManager.update_app('EventC', new_executable='e.exe')
+        terrarium.AppManager.update_app('EventC', new_executable='f.exe')
+        terrarium.AppManager.delete_app('EventD')
+
+    assert _describe(_events) == [('ResourceDeleted', 'EventA', None),
+                                  ('ResourceUpdated', 'EventC', None)]
+
+
+def test_events_failing_subscriber(_events):
+    def fail(event):
+        raise RuntimeError('Subscriber failure')
+
+    terrarium.subscribe(fail)
+    try:
+        terrarium.AppManager.create_app('EventA', '%ROOT%', 'Event.exe')
+    finally:
+        terrarium.unsubscribe(fail)
+
+    assert _describe(_events) == [('ResourceCreated', 'EventA', None)]
+
+
+def test_events_unsubscribe():
+    events = []
+    terrarium.subscribe(events.append)
+    terrarium.unsubscribe(events.append)
+
+    terrarium.AppManager.create_app('EventA', '%ROOT%', 'Event.exe')
+    terrarium.AppManager.delete_app('EventA')
+
+    assert events == []
+
+
+if __name__ == '__main__':
+    pytest.main()
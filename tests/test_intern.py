@@ -0,0 +1,63 @@
+import pytest
+
+import terrarium
+
+
+@pytest.fixture
+def _interning(request):
+    terrarium.interning.clear()
+
+    def fin():
+        terrarium.interning.clear()
+    request.addfinalizer(fin)
+
+
+def test_intern_string(_interning):
+    first = u''.join([u'tool', u'_root'])
+    second = u''.join([u'tool', u'_root'])
+    assert first is not second
+
+    assert terrarium.interning.intern_string(first) is first
+    assert terrarium.interning.intern_string(second) is first
+
+    shared = terrarium.interning.intern_string(second)
+    stats = terrarium.interning.stats()
+    assert stats['unique'] == 1
+    assert stats['references'] == 2
+    assert stats['bytes_saved'] > 0
+    assert stats['dedup_ratio'] == 2.0
+
+    del first, shared
+    assert terrarium.interning.stats()['references'] == 0
+
+
+def test_intern_prune(_interning):
+    kept = terrarium.interning.intern_string(u''.join([u'kept', u'_root']))
+    for index in xrange(5000):
+        terrarium.interning.intern_string(u'temporary_{0}'.format(index))
+
+    assert terrarium.interning.stats()['unique'] <= terrarium.interning._MIN_PRUNE_SIZE + 1
+    assert terrarium.interning.intern_string(u''.join([u'kept', u'_root'])) is kept
+
+
+def test_intern_environment_variables(_interning):
+    env_a = terrarium.Environment('InternA', variables={'TOOLS': '@[ROOT]@/tools'})
+    env_b = terrarium.Environment('InternB', variables={u''.join([u'TO', u'OLS']): u''.join([u'@[ROOT]@', u'/tools'])})
+
+    name_a, value_a = env_a.variables.items()[0]
+    name_b, value_b = env_b.variables.items()[0]
+    assert name_a is name_b
+    assert value_a is value_b
+
+
+def test_intern_app(_interning):
+    app_a = terrarium.App('InternA', '%ROOT%/bin', 'tool.exe')
+    app_b = terrarium.App('InternB', u''.join([u'%ROOT%', u'/bin']), u''.join([u'tool', u'.exe']))
+
+    assert app_a.location is app_b.location
+    assert app_a.executable is app_b.executable
+    assert terrarium.interning.stats()['dedup_ratio'] == 2.0
+
+
+if __name__ == '__main__':
+    pytest.main()
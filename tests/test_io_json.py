@@ -8,6 +8,10 @@ import terrarium
 _LOG = logging.getLogger(__name__)
 
 
+def _fail_copy(self):
+    raise AssertionError('Exports read the views rather than copying through the accessors')
+
+
 def test_import_app():
     app_data = {'name': 'TestApp',
                 'location': '%ROOT%',
@@ -82,6 +86,17 @@ def test_import_environment_force():
     assert updated_env.parent == 'Pass'
 
 
+def test_export_environment(monkeypatch):
+    env_data = {'name': 'TestEnv',
+                'parent': 'Pass',
+                'variables': {'foo': 'bar'},
+                'description': 'I am a test Env.'}
+    monkeypatch.setattr(terrarium.Environment, 'variables', property(_fail_copy))
+
+    exported_data = terrarium.json.export_environment('TestEnv')
+    assert env_data == json.loads(exported_data)
+
+
 def test_import_runtime_profile():
     profile_data = {'name': 'TestProfile',
                     'app': 'TestApp',
@@ -117,3 +132,17 @@ def test_import_runtime_profile_force():
     assert updated_profile is terrarium.RuntimeProfileManager.get_runtime_profile('TestProfile')
     assert updated_profile.app == 'PassApp'
     assert updated_profile.environment == 'PassEnv'
+
+
+def test_export_runtime_profile(monkeypatch):
+    profile_data = {'name': 'TestProfile',
+                    'app': 'PassApp',
+                    'environment': 'PassEnv',
+                    'arguments': ['Foo'],
+                    'keyword_arguments': {'Boz': 'Baz'},
+                    'description': 'I am a test Runtime Profile.'}
+    monkeypatch.setattr(terrarium.RuntimeProfile, 'arguments', property(_fail_copy))
+    monkeypatch.setattr(terrarium.RuntimeProfile, 'keyword_arguments', property(_fail_copy))
+
+    exported_data = terrarium.json.export_runtime_profile('TestProfile')
+    assert profile_data == json.loads(exported_data)
@@ -0,0 +1,134 @@
+import copy
+import logging
+import os
+import pickle
+import subprocess
+import sys
+
+import pytest
+
+import terrarium
+
+_LOG = logging.getLogger(__name__)
+
+
+_COUNT = 20000
+
+_KINDS = ['App', 'Environment', 'RuntimeProfile']
+
+_MEASURE = """
+import gc, os, sys
+import terrarium
+
+def unslotted(cls):
+    # Shadowing the slot descriptors with plain class attributes makes instances store those attributes in a __dict__
+    # instead, as they did before the resources used __slots__.
+    slots = set()
+    for base in cls.__mro__:
+        slots.update(base.__dict__.get('__slots__', ()))
+    slots.discard('__weakref__')
+    return type(cls.__name__, (cls,), dict.fromkeys(slots))
+
+def build(cls, i):
+    if issubclass(cls, terrarium.App):
+        return cls(u'App%d' % i, u'%ROOT%/bin', u'app.exe', description=u'Memory')
+    if issubclass(cls, terrarium.Environment):
+        return cls(u'Env%d' % i, variables={u'ROOT': u'/studio', u'BIN': u'%ROOT%/bin'}, description=u'Memory')
+    return cls(u'Profile%d' % i, u'App', u'Env', [u'-v'], {u'mode': u'fast'}, u'Memory')
+
+def resident():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+def measure(cls, count):
+    warm = [build(cls, i) for i in range(100)]
+    gc.collect()
+    before = resident()
+    resources = [build(cls, i) for i in xrange(count)]
+    gc.collect()
+    return (resident() - before) // count
+
+kind, count = sys.argv[1], int(sys.argv[2])
+cls = getattr(terrarium, kind)
+if sys.argv[3] == 'dict':
+    cls = unslotted(cls)
+    assert build(cls, 0).__dict__
+print measure(cls, count)
+"""
+
+
+def _resident_bytes_per_resource(kind, storage):
+    """
+    Measures the resident memory added by each of a large number of resources, in a fresh interpreter.
+
+    Args:
+        kind (str): The name of the resource class.
+        storage (str): ``slots`` to measure the class itself, or ``dict`` to measure a subclass that stores the same
+            attributes in a ``__dict__``.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(terrarium.__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([root, os.environ.get('PYTHONPATH', '')]))
+    output = subprocess.check_output([sys.executable, '-c', _MEASURE, kind, str(_COUNT), storage], env=env)
+    return int(output)
+
+
+@pytest.mark.skipif(not os.path.exists('/proc/self/statm') or sys.maxsize <= 2 ** 32,
+                    reason='Resident memory is measured through /proc on 64-bit Linux.')
+@pytest.mark.parametrize('kind', _KINDS)
+def test_resource_memory(kind):
+    slotted = _resident_bytes_per_resource(kind, 'slots')
+    unslotted = _resident_bytes_per_resource(kind, 'dict')
+    _LOG.info('%s: %d resident bytes per resource, %d with a __dict__', kind, slotted, unslotted)
+
+    assert slotted < unslotted * 0.75
+
+
+@pytest.mark.parametrize('protocol', [0, pickle.HIGHEST_PROTOCOL])
+def test_resource_pickle(protocol):
+    app = terrarium.App('PickleApp', '%ROOT%/bin', 'pickle.exe', description='Pickle')
+    env = terrarium.Environment('PickleEnv', parent='PickleParent', variables={'ROOT': '/pickle', 'BIN': '%ROOT%/bin'})
+    profile = terrarium.RuntimeProfile('PickleProfile', 'PickleApp', 'PickleEnv', ['-v', '-x'], {'mode': 'fast'})
+    env.expand('%BIN%')
+
+    for resource in (app, env, profile):
+        loaded = pickle.loads(pickle.dumps(resource, protocol))
+        assert type(loaded) is type(resource)
+        assert loaded == resource
+        assert loaded.name == resource.name
+        assert loaded.description == resource.description
+
+    loaded = pickle.loads(pickle.dumps(env, protocol))
+    assert loaded.parent == 'PickleParent'
+    assert loaded.expand('%BIN%') == env.expand('%BIN%')
+    loaded['ROOT'] = '/other'
+    assert env.expand('%BIN%') != loaded.expand('%BIN%')
+
+    loaded = pickle.loads(pickle.dumps(profile, protocol))
+    assert loaded.arguments == profile.arguments
+    assert loaded.keyword_arguments == profile.keyword_arguments
+
+    assert copy.deepcopy(env) == env
+
+
+def test_resource_unpickle_dict_state():
+    env = terrarium.Environment.__new__(terrarium.Environment)
+    env.__setstate__({'_name': u'PickleEnv', '_parent': None, '_description': None, '_vars': {u'ROOT': u'/pickle'}})
+    assert env.expand('%ROOT%/bin') == terrarium.Environment('PickleEnv', variables={'ROOT': '/pickle'}).expand(
+        '%ROOT%/bin')
+
+    profile = terrarium.RuntimeProfile.__new__(terrarium.RuntimeProfile)
+    profile.__setstate__({'_name': u'PickleProfile', '_app': u'PickleApp', '_environment': u'PickleEnv',
+                          '_args': [u'-v'], '_kwargs': {}, '_description': None})
+    assert profile.arguments == [u'-v']
+
+
+def test_resource_attributes_fixed():
+    app = terrarium.App('MemoryApp', '%ROOT%/bin', 'memory.exe')
+    assert not hasattr(app, '__dict__')
+
+    with pytest.raises(AttributeError):
+        app.colour = 'blue'
+
+
+if __name__ == '__main__':
+    pytest.main()
@@ -0,0 +1,94 @@
+import logging
+
+import pytest
+
+import terrarium
+
+_LOG = logging.getLogger(__name__)
+
+
+@pytest.fixture
+def _metrics(request):
+    terrarium.metrics.reset()
+    terrarium.metrics.enable()
+
+    app = terrarium.AppManager.create_app('MetricsApp', '%ROOT%', 'Metrics.exe')
+    env = terrarium.EnvironmentManager.create_environment('MetricsEnv', variables={'ROOT': 'C:'})
+
+    def fin():
+        terrarium.metrics.disable()
+        terrarium.metrics.reset()
+        terrarium.AppManager.delete_app('MetricsApp')
+        terrarium.EnvironmentManager.delete_environment('MetricsEnv')
+    request.addfinalizer(fin)
+
+    return app, env
+
+
+def test_metrics_operations(_metrics):
+    app, env = _metrics
+
+    terrarium.AppManager.get_app('MetricsApp')
+    terrarium.AppManager.get_app('MetricsApp')
+    with pytest.raises(terrarium.ResourceNotFoundError):
+        terrarium.AppManager.get_app('Missing')
+
+    operations = terrarium.metrics.snapshot()['operations']
+    stats = operations['AppManager.get']
+    assert stats['count'] == 3
+    assert stats['errors'] == 1
+    assert 0 <= stats['min'] <= stats['mean'] <= stats['max']
+    assert sum(count for _, count in stats['histogram']) == 3
+    assert operations['AppManager.create']['count'] == 1
+    assert operations['EnvironmentManager.create']['count'] == 1
+
+
+def test_metrics_caches(_metrics):
+    app, env = _metrics
+
+    env.expand('%ROOT%/metrics')
+    env.expand('%ROOT%/metrics')
+    terrarium.AppManager.find_apps('^Metrics')
+    terrarium.AppManager.find_apps('^Metrics')
+
+    snapshot = terrarium.metrics.snapshot()
+    assert snapshot['caches']['Environment.expand'] == {'hits': 1, 'misses': 1}
+    assert snapshot['caches']['ResourceManager.query'] == {'hits': 1, 'misses': 1}
+    assert snapshot['operations']['Environment.expand']['count'] == 2
+    assert snapshot['operations']['AppManager.find']['count'] == 2
+
+
+def test_metrics_disabled(_metrics):
+    terrarium.metrics.disable()
+    terrarium.metrics.reset()
+
+    terrarium.AppManager.get_app('MetricsApp')
+    _metrics[1].expand('%ROOT%')
+
+    assert terrarium.metrics.snapshot() == {'operations': {}, 'caches': {}}
+
+
+def test_metrics_with_hooks(_metrics):
+    terrarium.metrics.disable()
+    terrarium.metrics.reset()
+
+    spans = []
+    handle = terrarium.tracing.add_hook(after=spans.append)
+    try:
+        terrarium.EnvironmentManager.get_environment('MetricsEnv')
+    finally:
+        terrarium.tracing.remove_hook(handle)
+    terrarium.EnvironmentManager.get_environment('MetricsEnv')
+
+    assert [span.operation for span in spans] == ['EnvironmentManager.get']
+    assert terrarium.metrics.snapshot() == {'operations': {}, 'caches': {}}
+
+    terrarium.metrics.enable()
+    terrarium.AppManager.get_app('MetricsApp')
+    terrarium.EnvironmentManager.get_environment('MetricsEnv')
+
+    assert sorted(terrarium.metrics.snapshot()['operations']) == ['AppManager.get', 'EnvironmentManager.get']
+
+
+if __name__ == '__main__':
+    pytest.main()
@@ -0,0 +1,97 @@
+import os
+
+import pytest
+
+import terrarium
+
+
+@pytest.fixture
+def _environ(request):
+    orig_values = dict((name, os.environ.get(name)) for name in ('TERRARIUM_ROOT', 'TERRARIUM_TOOLS'))
+
+    os.environ['TERRARIUM_ROOT'] = '/root'
+    os.environ['TERRARIUM_TOOLS'] = '$TERRARIUM_ROOT/tools'
+
+    def fin():
+        for name, value in orig_values.iteritems():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+    request.addfinalizer(fin)
+
+
+def test_runtime_environment_expanded_values(_environ):
+    snapshot = terrarium.get_runtime_environment()
+
+    assert snapshot['TERRARIUM_TOOLS'] == '/root/tools'
+    assert snapshot.variables['TERRARIUM_TOOLS'] == '$TERRARIUM_ROOT/tools'
+    assert snapshot.expandvars('${TERRARIUM_TOOLS}/bin:$UNKNOWN_VAR') == '/root/tools/bin:$UNKNOWN_VAR'
+
+
+def test_runtime_environment_reuse(_environ):
+    snapshot = terrarium.get_runtime_environment()
+
+    assert terrarium.get_runtime_environment() is snapshot
+
+    os.environ['TERRARIUM_ROOT'] = '/other'
+
+    updated_snapshot = terrarium.get_runtime_environment()
+    assert updated_snapshot is not snapshot
+    assert updated_snapshot.version > snapshot.version
+    assert updated_snapshot['TERRARIUM_TOOLS'] == '/other/tools'
+
+
+@pytest.fixture
+def _tracking(request):
+    terrarium.set_environ_tracking(True)
+    request.addfinalizer(lambda: terrarium.set_environ_tracking(False))
+
+
+def test_runtime_environment_untracked(_environ):
+    data = os.environ.data
+    snapshot = terrarium.get_runtime_environment()
+
+    assert not terrarium.is_environ_tracking()
+    assert os.environ.data is data and type(data) is dict
+
+    os.environ['TERRARIUM_ROOT'] = '/root'
+    assert terrarium.get_runtime_environment() is snapshot
+    os.environ['TERRARIUM_ROOT'] = '/other'
+    assert terrarium.get_runtime_environment()['TERRARIUM_TOOLS'] == '/other/tools'
+
+
+@pytest.mark.parametrize('tracked', [False, True])
+def test_runtime_environment_changes(_environ, request, monkeypatch, tracked):
+    if tracked:
+        request.getfixturevalue('_tracking')
+        assert terrarium.is_environ_tracking()
+    snapshot = terrarium.get_runtime_environment()
+
+    os.environ['TERRARIUM_ROOT'] = '/root'
+    assert terrarium.get_runtime_environment() is snapshot
+
+    os.environ.pop('TERRARIUM_TOOLS')
+    assert 'TERRARIUM_TOOLS' not in terrarium.get_runtime_environment()
+
+    os.putenv('TERRARIUM_PUTENV', '/putenv')
+    assert 'TERRARIUM_PUTENV' not in terrarium.get_runtime_environment()
+    os.unsetenv('TERRARIUM_PUTENV')
+
+    monkeypatch.setattr(os.environ, 'data', dict(os.environ.data, TERRARIUM_TOOLS='/data'))
+    assert terrarium.get_runtime_environment()['TERRARIUM_TOOLS'] == '/data'
+    monkeypatch.undo()
+
+    monkeypatch.setattr(os, 'environ', dict(os.environ, TERRARIUM_TOOLS='/replaced'))
+    assert terrarium.get_runtime_environment()['TERRARIUM_TOOLS'] == '/replaced'
+
+
+def test_runtime_environment_compression(_environ):
+    environment = terrarium.Environment('test')
+
+    result = environment.compress('/root/tools/bin', var_format='${0}')
+    assert result == os.path.normpath('$TERRARIUM_TOOLS/bin')
+
+
+if __name__ == '__main__':
+    pytest.main()
@@ -27,5 +27,35 @@ def test_runtime_profile_equivalency():
     assert profile_a != profile_c
 
 
+def test_runtime_profile_views():
+    profile = terrarium.RuntimeProfile('TestProfile', 'TestApp', 'TestEnvironment',
+                                       cmd_args=['foo', 'bar'], cmd_kwargs={'baz': 'boz'})
+
+    args = profile.arguments_view
+    kwargs = profile.keyword_arguments_view
+    assert args == ['foo', 'bar']
+    assert args == profile.arguments
+    assert kwargs == {'baz': 'boz'}
+    with pytest.raises(TypeError):
+        args[0] = 'biz'
+    with pytest.raises(TypeError):
+        kwargs['baz'] = 'biz'
+
+    profile.arguments = ['foo', 'qux']
+    profile.keyword_arguments = {'baz': 'biz'}
+    assert args == ['foo', 'qux']
+    assert args.copy() == profile.arguments
+    assert kwargs == {'baz': 'biz'}
+
+
+def test_runtime_profile_argument_order():
+    profile = terrarium.RuntimeProfile('TestProfile', 'TestApp', 'TestEnvironment',
+                                       cmd_args=['-c', '-a', '-b', '-a'], cmd_kwargs={})
+    assert profile.arguments == ['-c', '-a', '-b']
+
+    profile.arguments = ['-d', '-b', '-c', '-e']
+    assert profile.arguments == ['-c', '-b', '-d', '-e']
+
+
 if __name__ == '__main__':
     pytest.main()
@@ -61,3 +61,79 @@ def test_profile_update_description(_profile):
     terrarium.RuntimeProfileManager.update_runtime_profile('Test', new_description='This is a Pass Profile!')
 
     assert _profile.description == 'This is a Pass Profile!'
+
+
+def test_profile_find_by_app(_profile):
+    assert terrarium.RuntimeProfileManager.find_runtime_profiles_by_app('TestApp') == [_profile]
+    assert terrarium.RuntimeProfileManager.find_runtime_profiles_by_environment('TestEnv') == [_profile]
+
+    terrarium.RuntimeProfileManager.update_runtime_profile('Test', new_app='OtherApp')
+
+    assert terrarium.RuntimeProfileManager.find_runtime_profiles_by_app('TestApp') == []
+    assert terrarium.RuntimeProfileManager.find_runtime_profiles_by_app('OtherApp') == [_profile]
+
+
+def test_profile_find_by_app_after_rename(_profile):
+    terrarium.RuntimeProfileManager.update_runtime_profile('Test', new_name='Pass')
+
+    result = terrarium.RuntimeProfileManager.find_runtime_profiles_by_app('TestApp')
+    assert len(result) == 1
+    assert result[0] is _profile
+
+
+def test_profile_find_by_app_after_delete(_profile):
+    terrarium.RuntimeProfileManager.delete_runtime_profile('Test')
+
+    assert terrarium.RuntimeProfileManager.find_runtime_profiles_by_app('TestApp') == []
+
+
+def test_profile_query(_profile):
+    manager = terrarium.RuntimeProfileManager
+    other = manager.create_runtime_profile('TestOther', 'OtherApp', 'ShotEnv', cmd_args=[], cmd_kwargs={})
+    try:
+        query = terrarium.Equals('app', 'TestApp') & terrarium.In('environment', ['TestEnv', 'ShotEnv'])
+        assert manager.query_runtime_profiles(query) == [_profile]
+
+        query = terrarium.Equals('app', 'TestApp') | terrarium.Equals('environment', 'ShotEnv')
+        assert manager.query_runtime_profiles(query) == [_profile, other]
+
+        query = terrarium.AllOf(terrarium.Matches('name', '^Test'), terrarium.Matches('description', '.*test Env'))
+        assert manager.query_runtime_profiles(query) == [_profile]
+
+        query = terrarium.AnyOf(terrarium.Matches('name', '^TestO'), terrarium.Equals('app', 'TestApp'))
+        assert manager.query_runtime_profiles(query) == [_profile, other]
+
+        with pytest.raises(terrarium.ResourceAttributeNotFoundError):
+            manager.query_runtime_profiles(terrarium.Equals('missing', 'value'))
+    finally:
+        manager.delete_runtime_profile('TestOther')
+
+
+def test_profile_query_plan(_profile):
+    manager = terrarium.RuntimeProfileManager
+
+    query = terrarium.Equals('app', 'TestApp') & terrarium.Matches('description', 'This')
+    cost, names, exact = query.plan(manager)
+    assert list(names) == ['Test']
+    assert not exact
+
+    cost, names, exact = terrarium.Matches('description', 'This').plan(manager)
+    assert names is None
+
+
+def test_profile_query_plan_prefix(_profile):
+    manager = terrarium.RuntimeProfileManager
+    names = [u'Pla', u'Plan', u'Plan\uffff', u'Plao', u'Plana']
+    manager.create_many([{'name': n, 'app': 'TestApp', 'environment': 'TestEnv', 'cmd_args': [], 'cmd_kwargs': {}}
+                         for n in names])
+    try:
+        cost, candidates, exact = terrarium.Matches('name', '^Plan').plan(manager)
+        assert cost == 3
+        assert list(candidates) == [u'Plan', u'Plana', u'Plan\uffff']
+        assert exact
+
+        cost, candidates, exact = terrarium.In('name', ['Pla', 'Plana', 'Missing']).plan(manager)
+        assert cost == 2
+        assert sorted(candidates) == [u'Pla', u'Plana']
+    finally:
+        manager.delete_many(names)
@@ -0,0 +1,68 @@
+import json
+import logging
+import os
+import shutil
+import tempfile
+
+import pytest
+
+import terrarium
+
+_LOG = logging.getLogger(__name__)
+
+
+@pytest.fixture
+def _trace_dir(request):
+    path = tempfile.mkdtemp()
+    request.addfinalizer(lambda: shutil.rmtree(path))
+
+    terrarium.AppManager.create_app('TraceApp', '%ROOT%', 'Trace.exe')
+    request.addfinalizer(lambda: terrarium.AppManager.delete_app('TraceApp'))
+
+    return path
+
+
+def test_trace_hooks(_trace_dir):
+    started = []
+    finished = []
+    handle = terrarium.tracing.add_hook(before=started.append, after=finished.append)
+    try:
+        terrarium.AppManager.get_app('TraceApp')
+        with pytest.raises(terrarium.ResourceNotFoundError):
+            terrarium.AppManager.get_app('Missing')
+    finally:
+        terrarium.tracing.remove_hook(handle)
+
+    terrarium.AppManager.get_app('TraceApp')
+
+    assert [(s.operation, s.resource_type, s.resource_name) for s in started] == [
+        ('AppManager.get', 'App', 'TraceApp'), ('AppManager.get', 'App', 'Missing')]
+    assert [s.duration for s in started] == [None, None]
+    assert all(s.duration >= 0 for s in finished)
+    assert finished[0].error is None
+    assert isinstance(finished[1].error, terrarium.ResourceNotFoundError)
+
+
+def test_chrome_trace_export(_trace_dir):
+    path = os.path.join(_trace_dir, 'trace.json')
+    env = terrarium.EnvironmentManager.create_environment('TraceEnv', variables={'ROOT': 'C:'})
+    try:
+        with terrarium.tracing.ChromeTraceExporter(path) as exporter:
+            terrarium.AppManager.get_app('TraceApp')
+            env.expand('%ROOT%/trace')
+    finally:
+        terrarium.EnvironmentManager.delete_environment('TraceEnv')
+
+    with open(path) as trace_file:
+        trace = json.load(trace_file)
+
+    events = trace['traceEvents']
+    assert events == exporter.events
+    assert [(e['name'], e['cat'], e['args']['name']) for e in events] == [('AppManager.get', 'App', 'TraceApp'),
+                                                                         ('Environment.expand', 'Environment',
+                                                                          'TraceEnv')]
+    assert all(e['ph'] == 'X' and e['dur'] >= 0 for e in events)
+
+
+if __name__ == '__main__':
+    pytest.main()
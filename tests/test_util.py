@@ -0,0 +1,110 @@
+import logging
+import os
+
+import pytest
+
+import terrarium
+
+_LOG = logging.getLogger(__name__)
+
+
+@pytest.fixture
+def _launch(request):
+    _LOG.debug('create _launch')
+
+    app = terrarium.AppManager.create_app('UtilApp', '%ROOT%/bin', 'app.exe')
+    env = terrarium.EnvironmentManager.create_environment('UtilEnv', variables={'ROOT': '/opt/app',
+                                                                                'SCENE': '%ROOT%/scene.ma'})
+    profile = terrarium.RuntimeProfileManager.create_runtime_profile(
+        'UtilProfile', 'UtilApp', 'UtilEnv', cmd_args=['%SCENE%'], cmd_kwargs={'log': '%ROOT%/log.txt'})
+
+    def fin():
+        terrarium.RuntimeProfileManager.delete_runtime_profile(profile.name)
+        terrarium.EnvironmentManager.delete_environment(env.name)
+        terrarium.AppManager.delete_app(app.name)
+        _LOG.debug('teardown _launch')
+    request.addfinalizer(fin)
+
+    return app, env, profile
+
+
+def test_build_cmd(_launch):
+    result = terrarium.build_cmd('UtilProfile')
+
+    expected = ' '.join([os.path.join(os.path.normpath('/opt/app/bin'), 'app.exe'),
+                         os.path.normpath('/opt/app/scene.ma'),
+                         '-log', os.path.normpath('/opt/app/log.txt')])
+    assert result == expected
+
+
+def test_materialize_environ(_launch):
+    app, env, profile = _launch
+
+    result = terrarium.materialize_environ('UtilEnv', overrides={'ROOT': '/opt/other'})
+
+    assert result['SCENE'] == os.path.normpath('/opt/other/scene.ma')
+    assert result['ROOT'] == '/opt/other'
+    for name, value in os.environ.items():
+        if name not in env:
+            assert result[name] == value
+
+    result = terrarium.materialize_environ('UtilEnv', inherit=False)
+    assert result == {'ROOT': '/opt/app', 'SCENE': os.path.normpath('/opt/app/scene.ma')}
+
+
+def test_materialize_environ_native_strings(_launch):
+    for inherit in (True, False):
+        result = terrarium.materialize_environ('UtilEnv', overrides={'ROOT': u'/opt/other'}, inherit=inherit)
+
+        assert result['ROOT'] == '/opt/other'
+        assert all(type(name) is str and type(value) is str for name, value in result.iteritems())
+
+
+def test_materialize_environ_invalidation(_launch):
+    app, env, profile = _launch
+
+    result = terrarium.materialize_environ('UtilEnv', inherit=False)
+    result['ROOT'] = 'modified'
+    assert terrarium.materialize_environ('UtilEnv', inherit=False)['ROOT'] == '/opt/app'
+
+    env['ROOT'] = '/opt/new'
+    assert terrarium.materialize_environ('UtilEnv', inherit=False)['SCENE'] == os.path.normpath('/opt/new/scene.ma')
+
+
+def test_materialize_environ_runtime_change(_launch, monkeypatch):
+    monkeypatch.setenv('UTIL_XROOT', '/a')
+    overrides = {'ROOT': '$UTIL_XROOT/bin'}
+
+    assert terrarium.materialize_environ('UtilEnv', overrides=overrides, inherit=False)['ROOT'] == '/a/bin'
+
+    monkeypatch.setenv('UTIL_XROOT', '/b')
+    assert terrarium.materialize_environ('UtilEnv', overrides=overrides, inherit=False)['ROOT'] == '/b/bin'
+
+
+def test_apply_environment(_launch):
+    orig_environ = dict(os.environ)
+    os.environ['ROOT'] = '/opt/app'
+
+    applied = terrarium.apply_environment('UtilEnv')
+    try:
+        assert applied.changed == ['SCENE']
+        assert os.environ['SCENE'] == os.path.normpath('/opt/app/scene.ma')
+    finally:
+        applied.restore()
+        del os.environ['ROOT']
+
+    assert dict(os.environ) == orig_environ
+
+
+def test_apply_environment_context(_launch):
+    orig_environ = dict(os.environ)
+
+    with terrarium.apply_environment('UtilEnv', overrides={'ROOT': '/opt/other'}):
+        assert os.environ['ROOT'] == '/opt/other'
+        assert os.environ['SCENE'] == os.path.normpath('/opt/other/scene.ma')
+
+    assert dict(os.environ) == orig_environ
+
+
+if __name__ == '__main__':
+    pytest.main()